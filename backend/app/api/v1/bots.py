@@ -6,9 +6,10 @@ from uuid import UUID
 import json
 
 from app.core.database import get_db, get_redis
-from app.core.dependencies import Admin, Member
+from app.core.dependencies import Admin, Member, get_notification_service
 from app.common.types import CurrentUser
 from app.services.bot import BotService
+from app.services.notification import NotificationService
 from app.services.storage import minio_service
 from app.config.settings import settings
 from app.schemas.upload import (
@@ -43,6 +44,7 @@ async def create_bot(
     bot_data: BotCreate,
     db: AsyncSession = Depends(get_db),
     redis: Redis = Depends(get_redis),
+    notification_service: NotificationService = Depends(get_notification_service),
     current_user: CurrentUser = Depends(Admin)
 ):
     """
@@ -78,9 +80,6 @@ async def create_bot(
     """
     bot_service = BotService(db, redis)
 
-    from app.services.notification import NotificationService
-    notification_service = NotificationService(db, redis)
-
     try:
         bot = await bot_service.create(
             name=bot_data.name,
@@ -500,6 +499,7 @@ async def recrawl_bot_origin(
     bot_id: UUID,
     db: AsyncSession = Depends(get_db),
     redis: Redis = Depends(get_redis),
+    notification_service: NotificationService = Depends(get_notification_service),
     current_user: CurrentUser = Depends(Admin)
 ):
     """
@@ -520,9 +520,6 @@ async def recrawl_bot_origin(
     """
     bot_service = BotService(db, redis)
 
-    from app.services.notification import NotificationService
-    notification_service = NotificationService(db, redis)
-
     try:
         result = await bot_service.recrawl_origin(str(bot_id))
 
@@ -8,23 +8,27 @@ import asyncio
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
 from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from redis.asyncio import Redis
 
-from app.core.dependencies import get_db, get_redis, Admin
+from app.core.dependencies import get_db, get_redis, get_document_service, get_notification_service, Admin
 from app.core.security import decode_token, verify_token_type
+from app.core.pubsub import pubsub_pool
 from app.common.types import CurrentUser
 from app.common.enums import DocumentStatus, JobStatus, UserRole
 from app.schemas.document import (
     DocumentResponse,
     DocumentListResponse,
     DocumentJobResponse,
+    BatchChunkData,
     BatchImportRequest,
     BatchImportResponse,
     ActiveTaskResponse,
     ActiveTasksListResponse
 )
 from app.services.document import DocumentService
+from app.services.notification import NotificationService
 from app.services.rabbitmq import rabbitmq_publisher
 from app.cache.keys import CacheKeys
 from app.utils.logging import get_logger
@@ -32,6 +36,29 @@ from app.utils.logging import get_logger
 router = APIRouter()
 logger = get_logger(__name__)
 
+TASK_STATE_TTL = 86400
+
+_BATCH_CHUNKS_ADAPTER = TypeAdapter(list[BatchChunkData])
+
+
+async def _write_task_state(redis: Redis, task_id: str, bot_id: str) -> None:
+    """Seed initial task state for SSE resume (hset + expire in one round trip)."""
+    state_key = CacheKeys.task_state(task_id)
+    pipe = redis.pipeline(transaction=False)
+    pipe.hset(
+        state_key,
+        mapping={
+            "task_id": task_id,
+            "bot_id": bot_id,
+            "progress": "0",
+            "status": "PENDING",
+            "message": "Task queued, waiting to start...",
+            "timestamp": str(uuid.uuid4())
+        }
+    )
+    pipe.expire(state_key, TASK_STATE_TTL)
+    await pipe.execute()
+
 
 @router.post(
     "/bots/{bot_id}/documents/upload",
@@ -45,7 +72,9 @@ async def upload_document(
     title: Optional[str] = None,
     current_user: CurrentUser = Depends(Admin),
     db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis)
+    redis: Redis = Depends(get_redis),
+    doc_service: DocumentService = Depends(get_document_service),
+    notification_service: NotificationService = Depends(get_notification_service)
 ):
     """
     Upload document file for bot knowledge base.
@@ -55,11 +84,6 @@ async def upload_document(
     
     Returns task info with SSE endpoint for progress tracking.
     """
-    doc_service = DocumentService(db, redis)
-
-    from app.services.notification import NotificationService
-    notification_service = NotificationService(db, redis)
-
     try:
         document, task_id, local_file_path = await doc_service.create_from_file(
             bot_id=bot_id,
@@ -68,30 +92,22 @@ async def upload_document(
             title=title
         )
 
-        await notification_service.create_task_notification(
-            user_id=current_user.user_id,
-            task_id=task_id,
-            task_type="upload_document",
-            title=f"Uploading {file.filename}",
-            message="Processing document...",
-            bot_id=bot_id
+        # Task state seeding only touches Redis, so it runs alongside the
+        # notification insert; the commit then covers document + notification
+        await asyncio.gather(
+            notification_service.create_task_notification(
+                user_id=current_user.user_id,
+                task_id=task_id,
+                task_type="upload_document",
+                title=f"Uploading {file.filename}",
+                message="Processing document...",
+                bot_id=bot_id
+            ),
+            _write_task_state(redis, task_id, bot_id)
         )
 
         await db.commit()
         
-        await redis.hset(
-            CacheKeys.task_state(task_id),
-            mapping={
-                "task_id": task_id,
-                "bot_id": bot_id,
-                "progress": "0",
-                "status": "PENDING",
-                "message": "Task queued, waiting to start...",
-                "timestamp": str(uuid.uuid4()) 
-            }
-        )
-        await redis.expire(CacheKeys.task_state(task_id), 86400)
-        
         await rabbitmq_publisher.publish_file_upload_task(
             task_id=task_id,
             document_id=str(document.id),
@@ -184,7 +200,7 @@ async def batch_import(
         
         doc_service = DocumentService(db, redis)
         
-        batch_data_list = [chunk.model_dump() for chunk in request.batch_data]
+        batch_data_list = _BATCH_CHUNKS_ADAPTER.dump_python(request.batch_data)
         
         result = await doc_service.validate_batch_import(
             task_id=request.task_id,
@@ -207,15 +223,15 @@ async def batch_import(
             "status": status_text,
             "message": f"Batch {request.batch_index + 1}/{request.total_batches} imported ({request.chunks_in_batch} chunks)",
             "timestamp": str(uuid.uuid4()),
-            "batch_info": json.dumps({
-                "batch_index": request.batch_index,
-                "total_batches": request.total_batches,
-                "chunks_in_batch": request.chunks_in_batch,
-                "source_type": request.source_type,
-                "file_path": request.file_path,
-                "web_url": request.web_url
-            })
+            "bi_batch_index": request.batch_index,
+            "bi_total_batches": request.total_batches,
+            "bi_chunks_in_batch": request.chunks_in_batch,
+            "bi_source_type": request.source_type
         }
+        if request.file_path:
+            progress_data["bi_file_path"] = request.file_path
+        if request.web_url:
+            progress_data["bi_web_url"] = request.web_url
         
         await redis.hset(
             CacheKeys.task_state(request.task_id),
@@ -349,72 +365,69 @@ async def stream_task_progress(
     
     async def event_generator():
         """Generate SSE events from Redis Pub/Sub"""
-        pubsub = redis.pubsub()
-        await pubsub.subscribe(channel)
-        
-        try:
-            state_key = CacheKeys.task_state(task_id)
-            cached_state = await redis.hgetall(state_key)
-            if cached_state:
-                state_data = {
-                    k.decode() if isinstance(k, bytes) else k: 
-                    v.decode() if isinstance(v, bytes) else v
-                    for k, v in cached_state.items()
-                }
-                yield f"event: restore\ndata: {json.dumps(state_data)}\n\n"
+        async with pubsub_pool.lease(redis, channel) as pubsub:
+            try:
+                state_key = CacheKeys.task_state(task_id)
+                cached_state = await redis.hgetall(state_key)
+                if cached_state:
+                    state_data = {
+                        k.decode() if isinstance(k, bytes) else k: 
+                        v.decode() if isinstance(v, bytes) else v
+                        for k, v in cached_state.items()
+                    }
+                    yield f"event: restore\ndata: {json.dumps(state_data)}\n\n"
             
-            yield f"event: connected\ndata: {json.dumps({'message': 'Connected to progress stream', 'task_id': task_id})}\n\n"
+                yield f"event: connected\ndata: {json.dumps({'message': 'Connected to progress stream', 'task_id': task_id})}\n\n"
             
-            last_heartbeat = asyncio.get_event_loop().time()
-            heartbeat_interval = 15
+                loop = asyncio.get_running_loop()
+                last_heartbeat = loop.time()
+                heartbeat_interval = 15
             
-            while True:
-                try:
-                    message = await asyncio.wait_for(
-                        pubsub.get_message(ignore_subscribe_messages=True),
-                        timeout=1.0
+                while True:
+                    # Block until a message arrives or the next heartbeat is due,
+                    # instead of waking up every second on idle streams
+                    wait_time = max(heartbeat_interval - (loop.time() - last_heartbeat), 0)
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=wait_time
                     )
+                
+                    if not message or message["type"] != "message":
+                        current_time = loop.time()
+                        if current_time - last_heartbeat >= heartbeat_interval:
+                            yield f": heartbeat\n\n"
+                            last_heartbeat = current_time
+                        continue
+                
+                    data = message["data"]
+                
+                    if isinstance(data, bytes):
+                        data = data.decode()
+                
+                    yield f"event: progress\ndata: {data}\n\n"
+                
+                    try:
+                        progress_data = json.loads(data)
+                        status = progress_data.get("status", "").lower()
                     
-                    if message and message["type"] == "message":
-                        data = message["data"]
-                        
-                        if isinstance(data, bytes):
-                            data = data.decode()
+                        if status in ["completed", "failed"]:
+                            yield f"event: done\ndata: {data}\n\n"
+                            logger.info(
+                                f"Task {task_id} completed with status: {status}",
+                                extra={"task_id": task_id, "status": status}
+                            )
+                            break
+                    except json.JSONDecodeError:
+                        logger.warning(f"Invalid JSON in progress data: {data}")
+                
+                    last_heartbeat = loop.time()
                         
-                        yield f"event: progress\ndata: {data}\n\n"
-                        
-                        try:
-                            progress_data = json.loads(data)
-                            status = progress_data.get("status", "").lower()
-                            
-                            if status in ["completed", "failed"]:
-                                yield f"event: done\ndata: {data}\n\n"
-                                logger.info(
-                                    f"Task {task_id} completed with status: {status}",
-                                    extra={"task_id": task_id, "status": status}
-                                )
-                                break
-                        except json.JSONDecodeError:
-                            logger.warning(f"Invalid JSON in progress data: {data}")
-                            pass
-                        
-                        last_heartbeat = asyncio.get_event_loop().time()
-                    
-                except asyncio.TimeoutError:
-                    current_time = asyncio.get_event_loop().time()
-                    if current_time - last_heartbeat >= heartbeat_interval:
-                        yield f": heartbeat\n\n"
-                        last_heartbeat = current_time
-                        
-        except asyncio.CancelledError:
-            logger.info(f"SSE stream cancelled for task {task_id}")
-            raise
-        except Exception as e:
-            logger.error(f"Error in SSE stream: {e}", exc_info=True)
-            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
-        finally:
-            await pubsub.unsubscribe(channel)
-            await pubsub.close()
+            except asyncio.CancelledError:
+                logger.info(f"SSE stream cancelled for task {task_id}")
+                raise
+            except Exception as e:
+                logger.error(f"Error in SSE stream: {e}", exc_info=True)
+                yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
     
     return StreamingResponse(
         event_generator(),
@@ -449,32 +462,26 @@ async def stream_document_progress(
     
     async def event_generator():
         """Generate SSE events from Redis Pub/Sub with heartbeat"""
-        pubsub = redis.pubsub()
-        await pubsub.subscribe(channel)
-        
-        try:
-            cache_key = f"{channel}:state"
-            cached_state = await redis.get(cache_key)
-            if cached_state:
-                yield f"event: restore\ndata: {cached_state}\n\n"
+        async with pubsub_pool.lease(redis, channel) as pubsub:
+            try:
+                cache_key = f"{channel}:state"
+                cached_state = await redis.get(cache_key)
+                if cached_state:
+                    yield f"event: restore\ndata: {cached_state}\n\n"
             
-            yield f"event: connected\ndata: {json.dumps({'message': 'Connected to progress stream'})}\n\n"
+                yield f"event: connected\ndata: {json.dumps({'message': 'Connected to progress stream'})}\n\n"
             
-            last_heartbeat = asyncio.get_event_loop().time()
-            heartbeat_interval = 15  
+                last_heartbeat = asyncio.get_event_loop().time()
+                heartbeat_interval = 15  
             
-            while True:
-                try:
-                    message = await asyncio.wait_for(
-                        pubsub.get_message(ignore_subscribe_messages=True),
-                        timeout=1.0
-                    )
-                    
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                
                     if message and message["type"] == "message":
                         data = message["data"]
-                        
+                    
                         yield f"event: progress\ndata: {data}\n\n"
-                        
+                    
                         try:
                             progress_data = json.loads(data)
                             if progress_data.get("status") in ["COMPLETED", "FAILED"]:
@@ -482,24 +489,21 @@ async def stream_document_progress(
                                 break
                         except json.JSONDecodeError:
                             pass
-                        
-                        last_heartbeat = asyncio.get_event_loop().time()
                     
-                except asyncio.TimeoutError:
+                        last_heartbeat = asyncio.get_event_loop().time()
+                        continue
+                
                     current_time = asyncio.get_event_loop().time()
                     if current_time - last_heartbeat >= heartbeat_interval:
                         yield f": heartbeat\n\n"
                         last_heartbeat = current_time
                         
-        except asyncio.CancelledError:
-            logger.info(f"SSE stream cancelled for document {document_id}")
-            raise
-        except Exception as e:
-            logger.error(f"Error in SSE stream: {e}", exc_info=True)
-            yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
-        finally:
-            await pubsub.unsubscribe(channel)
-            await pubsub.close()
+            except asyncio.CancelledError:
+                logger.info(f"SSE stream cancelled for document {document_id}")
+                raise
+            except Exception as e:
+                logger.error(f"Error in SSE stream: {e}", exc_info=True)
+                yield f"event: error\ndata: {json.dumps({'error': str(e)})}\n\n"
     
     return StreamingResponse(
         event_generator(),
@@ -543,7 +547,7 @@ async def list_documents(
     pages = (total + size - 1) // size
     
     return DocumentListResponse(
-        items=[DocumentResponse.from_orm_with_computed(doc) for doc in documents],
+        items=DocumentResponse.from_orm_list(documents),
         total=total,
         page=page,
         size=size,
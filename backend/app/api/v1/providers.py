@@ -4,14 +4,15 @@ Provider and Model management endpoints.
 - Public endpoints: List active providers/models (for bot configuration)
 - ROOT endpoints: Full CRUD management
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
-from redis.asyncio import Redis
 from typing import List, Optional
 from uuid import UUID
 
-from app.core.database import get_db, get_redis
-from app.core.dependencies import Root, Admin
+from app.core.database import get_db, transaction
+from app.core.dependencies import Root, Admin, get_provider_service
 from app.common.types import CurrentUser
 from app.services.provider import ProviderService
 from app.schemas.provider import (
@@ -26,13 +27,26 @@ from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+_PROVIDER_LIST_ADAPTER = TypeAdapter(List[ProviderResponse])
+_MODEL_LIST_ADAPTER = TypeAdapter(List[ModelResponse])
+
+
+def _list_response(adapter: TypeAdapter, items: list) -> Response:
+    """
+    Validate ORM rows once and encode them straight to JSON bytes.
+    
+    Returning a Response skips FastAPI's response_model pass; response_model
+    is kept on the route for the OpenAPI schema.
+    """
+    validated = adapter.validate_python(items, from_attributes=True)
+    return Response(content=adapter.dump_json(validated), media_type="application/json")
 
 
 @router.get("/active", response_model=List[ProviderResponse], dependencies=[Depends(Admin)])
 async def get_active_providers(
-    db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis),
+    provider_service: ProviderService = Depends(get_provider_service),
     current_user: CurrentUser = Depends(Admin)
 ):
     """
@@ -43,21 +57,14 @@ async def get_active_providers(
     Returns only ACTIVE and non-deleted providers with their models.
     Used when admin configures provider for a bot.
     """
-    provider_service = ProviderService(db, redis)
-    
-    providers = await provider_service.get_all_providers(
-        include_deleted=False,
-        status_filter=ProviderStatus.ACTIVE
-    )
-    
-    return providers
+    # Cached entries are already ProviderResponse-shaped JSON dicts
+    return ORJSONResponse(content=await provider_service.get_active_providers())
 
 
 @router.get("/{provider_id}/models/active", response_model=List[ModelResponse], dependencies=[Depends(Admin)])
 async def get_active_models(
     provider_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis),
+    provider_service: ProviderService = Depends(get_provider_service),
     current_user: CurrentUser = Depends(Admin)
 ):
     """
@@ -68,11 +75,8 @@ async def get_active_models(
     Returns only active and non-deleted models.
     Used when selecting model for bot provider configuration.
     """
-    provider_service = ProviderService(db, redis)
-    
-    models = await provider_service.get_active_models_by_provider(str(provider_id))
-    
-    return models
+    # Cached entries are already ModelResponse-shaped JSON dicts
+    return ORJSONResponse(content=await provider_service.get_active_models_cached(provider_id))
 
 
 # ============================================================================
@@ -83,8 +87,9 @@ async def get_active_models(
 async def get_providers(
     include_deleted: bool = Query(False, description="Include soft-deleted providers"),
     status_filter: Optional[ProviderStatus] = Query(None, description="Filter by status"),
-    db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis),
+    skip: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Page size; omit to list all providers"),
+    provider_service: ProviderService = Depends(get_provider_service),
     current_user: CurrentUser = Depends(Root)
 ):
     """
@@ -95,22 +100,22 @@ async def get_providers(
     Query Parameters:
     - **include_deleted**: Include soft-deleted providers
     - **status_filter**: Filter by ACTIVE or INACTIVE
+    - **skip** / **limit**: Optional pagination; without limit every provider is returned
     """
-    provider_service = ProviderService(db, redis)
-    
     providers = await provider_service.get_all_providers(
         include_deleted=include_deleted,
-        status_filter=status_filter
+        status_filter=status_filter,
+        skip=skip,
+        limit=limit
     )
     
-    return providers
+    return _list_response(_PROVIDER_LIST_ADAPTER, providers)
 
 
 @router.get("/{provider_id}", response_model=ProviderResponse, dependencies=[Depends(Root)])
 async def get_provider(
     provider_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis),
+    provider_service: ProviderService = Depends(get_provider_service),
     current_user: CurrentUser = Depends(Root)
 ):
     """
@@ -118,9 +123,7 @@ async def get_provider(
     
     **Required role:** root
     """
-    provider_service = ProviderService(db, redis)
-    
-    provider = await provider_service.get_provider_by_id(str(provider_id))
+    provider = await provider_service.get_provider_by_id(provider_id)
     
     if not provider:
         raise HTTPException(
@@ -136,7 +139,7 @@ async def update_provider(
     provider_id: UUID,
     provider_data: ProviderUpdate,
     db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis),
+    provider_service: ProviderService = Depends(get_provider_service),
     current_user: CurrentUser = Depends(Root)
 ):
     """
@@ -151,39 +154,24 @@ async def update_provider(
     - **api_base_url**: API base URL (e.g., https://api.openai.com/v1)
     - **status**: ACTIVE or INACTIVE
     """
-    provider_service = ProviderService(db, redis)
-    
-    try:
+    async with transaction(db, logger, "update provider"):
         updated_provider = await provider_service.update_provider(
-            provider_id=str(provider_id),
+            provider_id=provider_id,
             name=provider_data.name,
             api_base_url=provider_data.api_base_url,
             status=provider_data.status
         )
-        
-        await db.commit()
-        
-        logger.info(f"Provider updated: {updated_provider.name} by {current_user.email}")
-        
-        return updated_provider
-        
-    except HTTPException:
-        await db.rollback()
-        raise
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Failed to update provider {provider_id}: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to update provider: {str(e)}"
-        )
+    
+    logger.info(f"Provider updated: {updated_provider.name} by {current_user.email}")
+    
+    return updated_provider
 
 
 @router.delete("/{provider_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(Root)])
 async def delete_provider(
     provider_id: UUID,
     db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis),
+    provider_service: ProviderService = Depends(get_provider_service),
     current_user: CurrentUser = Depends(Root)
 ):
     """
@@ -197,32 +185,17 @@ async def delete_provider(
     
     **Warning:** This will deactivate all bots using this provider!
     """
-    provider_service = ProviderService(db, redis)
-    
-    try:
-        await provider_service.soft_delete_provider(str(provider_id))
-        
-        await db.commit()
-        
-        logger.warning(f"Provider soft deleted: {provider_id} by {current_user.email}")
-        
-    except HTTPException:
-        await db.rollback()
-        raise
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Failed to delete provider {provider_id}: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to delete provider: {str(e)}"
-        )
+    async with transaction(db, logger, "delete provider"):
+        await provider_service.soft_delete_provider(provider_id)
+    
+    logger.warning(f"Provider soft deleted: {provider_id} by {current_user.email}")
 
 
 @router.post("/{provider_id}/restore", response_model=ProviderResponse, dependencies=[Depends(Root)])
 async def restore_provider(
     provider_id: UUID,
     db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis),
+    provider_service: ProviderService = Depends(get_provider_service),
     current_user: CurrentUser = Depends(Root)
 ):
     """
@@ -232,27 +205,12 @@ async def restore_provider(
     
     Note: This does NOT restore models or bot configs. Those must be restored separately.
     """
-    provider_service = ProviderService(db, redis)
-    
-    try:
-        restored_provider = await provider_service.restore_provider(str(provider_id))
-        
-        await db.commit()
-        
-        logger.info(f"Provider restored: {restored_provider.name} by {current_user.email}")
-        
-        return restored_provider
-        
-    except HTTPException:
-        await db.rollback()
-        raise
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Failed to restore provider {provider_id}: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to restore provider: {str(e)}"
-        )
+    async with transaction(db, logger, "restore provider"):
+        restored_provider = await provider_service.restore_provider(provider_id)
+    
+    logger.info(f"Provider restored: {restored_provider.name} by {current_user.email}")
+    
+    return restored_provider
 
 
 # ============================================================================
@@ -263,8 +221,7 @@ async def restore_provider(
 async def get_models(
     provider_id: UUID,
     include_deleted: bool = Query(False, description="Include soft-deleted models"),
-    db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis),
+    provider_service: ProviderService = Depends(get_provider_service),
     current_user: CurrentUser = Depends(Root)
 ):
     """
@@ -272,14 +229,12 @@ async def get_models(
     
     **Required role:** root
     """
-    provider_service = ProviderService(db, redis)
-    
     models = await provider_service.get_models_by_provider(
-        provider_id=str(provider_id),
+        provider_id=provider_id,
         include_deleted=include_deleted
     )
     
-    return models
+    return _list_response(_MODEL_LIST_ADAPTER, models)
 
 
 @router.post("/{provider_id}/models", response_model=ModelResponse, dependencies=[Depends(Root)])
@@ -287,7 +242,7 @@ async def create_model(
     provider_id: UUID,
     model_data: ModelCreate,
     db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis),
+    provider_service: ProviderService = Depends(get_provider_service),
     current_user: CurrentUser = Depends(Root)
 ):
     """
@@ -307,9 +262,7 @@ async def create_model(
     - **pricing**: Cost per 1M tokens (legacy)
     - **extra_data**: Pricing config (cost_per_1k_input, cost_per_1k_output)
     """
-    provider_service = ProviderService(db, redis)
-    
-    try:
+    async with transaction(db, logger, "create model"):
         model = await provider_service.create_model(
             provider_id=provider_id,
             name=model_data.name,
@@ -318,23 +271,10 @@ async def create_model(
             pricing=model_data.pricing,
             extra_data=model_data.extra_data.model_dump() if model_data.extra_data else {}
         )
-        
-        await db.commit()
-        
-        logger.info(f"Model created/restored: {model.name} by {current_user.email}")
-        
-        return model
-        
-    except HTTPException:
-        await db.rollback()
-        raise
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Failed to create model: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to create model: {str(e)}"
-        )
+    
+    logger.info(f"Model created/restored: {model.name} by {current_user.email}")
+    
+    return model
 
 
 @router.put("/models/{model_id}", response_model=ModelResponse, dependencies=[Depends(Root)])
@@ -342,7 +282,7 @@ async def update_model(
     model_id: UUID,
     model_data: ModelUpdate,
     db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis),
+    provider_service: ProviderService = Depends(get_provider_service),
     current_user: CurrentUser = Depends(Root)
 ):
     """
@@ -357,41 +297,26 @@ async def update_model(
     - **pricing**: Cost per 1M tokens
     - **is_active**: Active status
     """
-    provider_service = ProviderService(db, redis)
-    
-    try:
+    async with transaction(db, logger, "update model"):
         updated_model = await provider_service.update_model(
-            model_id=str(model_id),
+            model_id=model_id,
             name=model_data.name,
             model_type=model_data.model_type,
             context_window=model_data.context_window,
             pricing=model_data.pricing,
             is_active=model_data.is_active
         )
-        
-        await db.commit()
-        
-        logger.info(f"Model updated: {updated_model.name} by {current_user.email}")
-        
-        return updated_model
-        
-    except HTTPException:
-        await db.rollback()
-        raise
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Failed to update model {model_id}: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to update model: {str(e)}"
-        )
+    
+    logger.info(f"Model updated: {updated_model.name} by {current_user.email}")
+    
+    return updated_model
 
 
 @router.delete("/models/{model_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=[Depends(Root)])
 async def delete_model(
     model_id: UUID,
     db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis),
+    provider_service: ProviderService = Depends(get_provider_service),
     current_user: CurrentUser = Depends(Root)
 ):
     """
@@ -404,22 +329,7 @@ async def delete_model(
     
     **Warning:** This will deactivate all bots using this model!
     """
-    provider_service = ProviderService(db, redis)
-    
-    try:
-        await provider_service.soft_delete_model(str(model_id))
-        
-        await db.commit()
-        
-        logger.warning(f"Model soft deleted: {model_id} by {current_user.email}")
-        
-    except HTTPException:
-        await db.rollback()
-        raise
-    except Exception as e:
-        await db.rollback()
-        logger.error(f"Failed to delete model {model_id}: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to delete model: {str(e)}"
-        )
+    async with transaction(db, logger, "delete model"):
+        await provider_service.soft_delete_model(model_id)
+    
+    logger.warning(f"Model soft deleted: {model_id} by {current_user.email}")
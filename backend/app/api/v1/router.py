@@ -3,111 +3,39 @@ Centralized API router for v1 endpoints.
 All routers are registered here and exported to main.py
 """
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 
 from app.api.v1 import auth, bots, chat, documents, others, providers, webhooks, widget, notifications, stats, workers
 from app.api.v1.admin import users, invites, visitors, tasks
 
 
-api_router = APIRouter()
-
-
-api_router.include_router(
-    auth.router,
-    prefix="/auth",
-    tags=["Authentication"]
-)
-
-
-api_router.include_router(
-    bots.router,
-    prefix="/bots",
-    tags=["Bots"]
-)
-
-
-api_router.include_router(
-    workers.router,
-    prefix="/bots",
-    tags=["Bot Workers"]
-)
-
-
-api_router.include_router(
-    documents.router,
-    prefix="",
-    tags=["Documents"]
-)
-
-
-api_router.include_router(
-    providers.router,
-    prefix="/providers",
-    tags=["Providers & Models"]
-)
-
-
-api_router.include_router(
-    chat.router,
-    prefix="/chat",
-    tags=["Chat"]
-)
-
-
-api_router.include_router(
-    users.router,
-    prefix="/admin/users",
-    tags=["Admin - Users"]
-)
-
-
-api_router.include_router(
-    invites.router,
-    prefix="/admin/invites",
-    tags=["Admin - Invites"]
-)
-
-
-api_router.include_router(
-    visitors.router,
-    prefix="/admin",
-    tags=["Admin - Visitors"]
-)
-
-
-api_router.include_router(
-    tasks.router,
-    prefix="/admin",
-    tags=["Admin - Tasks"]
-)
-
-
-api_router.include_router(
-    others.router,
-    prefix="/others",
-    tags=["Common"]
-)
-
-api_router.include_router(
-    webhooks.router,
-    prefix="",
-    tags=["Webhooks"]
-)
-
-api_router.include_router(
-    widget.router,
-    prefix="/widget",
-    tags=["Widget"]
-)
-
-api_router.include_router(
-    notifications.router,
-    prefix="/notifications",
-    tags=["Notifications"]
-)
-
-api_router.include_router(
-    stats.router,
-    prefix="",
-    tags=["Statistics"]
-)
-
+api_router = APIRouter(default_response_class=ORJSONResponse)
+
+
+# (router, prefix, tag, include_in_schema)
+_ROUTES = (
+    (auth.router, "/auth", "Authentication", True),
+    (bots.router, "/bots", "Bots", True),
+    (workers.router, "/bots", "Bot Workers", True),
+    (documents.router, "", "Documents", True),
+    (providers.router, "/providers", "Providers & Models", True),
+    (chat.router, "/chat", "Chat", True),
+    (users.router, "/admin/users", "Admin - Users", True),
+    (invites.router, "/admin/invites", "Admin - Invites", True),
+    (visitors.router, "/admin", "Admin - Visitors", True),
+    (tasks.router, "/admin", "Admin - Tasks", True),
+    (others.router, "/others", "Common", True),
+    # Internal service callbacks, kept out of OpenAPI
+    (webhooks.router, "", "Webhooks", False),
+    (widget.router, "/widget", "Widget", True),
+    (notifications.router, "/notifications", "Notifications", True),
+    (stats.router, "", "Statistics", True),
+)
+
+for router, prefix, tag, include_in_schema in _ROUTES:
+    api_router.include_router(
+        router,
+        prefix=prefix,
+        tags=[tag],
+        include_in_schema=include_in_schema
+    )
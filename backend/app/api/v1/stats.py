@@ -3,19 +3,22 @@ Statistics API endpoints for dashboard analytics.
 """
 from typing import Optional
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from redis.asyncio import Redis
 
-from app.core.database import get_db
+from app.core.database import get_db, get_redis
 from app.common.enums import TimePeriod
 from app.schemas.stats import StatsSummary, VisitorActivityResponse
 from app.services.stats import StatsService
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 @router.get("/stats/summary", response_model=StatsSummary)
 async def get_stats_summary(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis)
 ):
     """
     Get dashboard summary statistics.
@@ -25,7 +28,7 @@ async def get_stats_summary(
         - total_users: Count of all users
         - total_visitors: Count of unique visitors
     """
-    service = StatsService(db)
+    service = StatsService(db, redis)
     return await service.get_summary()
 
 
@@ -33,7 +36,8 @@ async def get_stats_summary(
 async def get_visitor_activity(
     bot_id: Optional[str] = Query(None, description="Bot ID to filter by"),
     period: TimePeriod = Query(TimePeriod.DAY, description="Time grouping period"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis)
 ):
     """
     Get visitor activity time-series data.
@@ -45,6 +49,6 @@ async def get_visitor_activity(
     Returns:
         Array of visitor activity data points with timestamp and count
     """
-    service = StatsService(db)
+    service = StatsService(db, redis)
     data = await service.get_visitor_activity(bot_id=bot_id, period=period)
     return VisitorActivityResponse(data=data)
@@ -6,41 +6,87 @@ Webhook endpoints for receiving notifications from internal services
 - visitor-grader: Visitor lead scoring results
 """
 from __future__ import annotations
-import json
-from fastapi import APIRouter, Request, HTTPException, status, Depends
+import asyncio
+import hashlib
+import logging
+import uuid
+import orjson
+from typing import Optional
+from fastapi import APIRouter, Request, Response, HTTPException, status, Depends, BackgroundTasks
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import update, insert, cast
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession
 from redis.asyncio import Redis
 
 from app.cache.invalidation import CacheInvalidation
+from app.config.settings import settings
 from app.cache.keys import CacheKeys
-from app.core.database import get_db, redis_manager
-from app.core.dependencies import get_redis
+from app.core.database import get_db, get_redis, db_manager, redis_manager
+from app.core.dependencies import get_document_service
 from app.schemas.webhook import (
     ChatCompletionPayload,
     FileProcessingUpdatePayload,
     SitemapCrawlUpdatePayload,
     WebhookResponse,
     VisitorGradingWebhook,
+    AssessmentQuestionResult,
 )
 from app.schemas.visitor import VisitorInfoUpdate
 from app.services.document import DocumentService
+from app.services.notification import NotificationService
 from app.services.visitor import VisitorService
 from app.services.chat import chat_service
+from app.models.document import Document
 from app.models.visitor import ChatMessage, ChatSession
-from app.common.enums import TaskType, AssessmentTaskType, LeadCategory
+from app.common.enums import TaskType, AssessmentTaskType, LeadCategory, DocumentStatus
 from app.models.usage import UsageLog
-from pydantic import ValidationError
-from app.utils.security import verify_webhook_signature
-from app.utils.logging import get_logger
+from pydantic import TypeAdapter, ValidationError
+from app.utils.datetime_utils import now
+from app.utils.logging import ContextLoggerAdapter, get_logger
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 logger = get_logger(__name__)
 
+# Core validator/serializer for visitor_info, bound once instead of going
+# through model_validate/model_dump on every chat completion
+_VISITOR_INFO_VALIDATOR = VisitorInfoUpdate.__pydantic_validator__
+_VISITOR_INFO_SERIALIZER = VisitorInfoUpdate.__pydantic_serializer__
+
+_sha256 = hashlib.sha256
+
+# Dumps assessment results in one core call instead of model_dump() per item
+_ASSESSMENT_RESULTS_ADAPTER = TypeAdapter(list[AssessmentQuestionResult])
+
+# Encoded once: the default success reply never changes
+_WEBHOOK_OK_BODY = orjson.dumps(WebhookResponse().model_dump())
+
+# webhook_delivery marker states; "done" is written only after the commit
+_DELIVERY_PROCESSING = "processing"
+_DELIVERY_DONE = "done"
+_DELIVERY_RETRY_AFTER = 5  # Seconds a duplicate of an in-progress delivery waits before retrying
+
 
 # ============================================================================
 # Chat Worker Webhook - Chat Completion
 # ============================================================================
 
+async def _handle_contact_request_task(**kwargs) -> None:
+    """
+    Send contact request notifications in a dedicated DB session.
+    Runs as a background task after the chat completion webhook has responded.
+    """
+    try:
+        async with db_manager.session() as db:
+            await VisitorService(db).handle_contact_request(**kwargs)
+    except Exception as e:
+        logger.error(
+            f"CONTACT NOTIFICATION: Failed to handle contact request: {e}",
+            exc_info=True,
+            extra={"bot_id": kwargs.get("bot_id"), "visitor_id": kwargs.get("visitor_id")}
+        )
+
+
 @router.post(
     "/webhooks/chat-completion",
     response_model=WebhookResponse,
@@ -48,6 +94,7 @@ logger = get_logger(__name__)
 )
 async def chat_completion_webhook(
     request: Request,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     """
@@ -59,118 +106,111 @@ async def chat_completion_webhook(
     - Saves long-term memory
     - Creates usage log
     
+    Signature is verified by WebhookSignatureMiddleware.
     Not exposed in API documentation.
     """
-    signature = request.headers.get("X-Webhook-Signature")
-    if not signature:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Missing webhook signature",
-        )
-
     body = await request.body()
-    if not verify_webhook_signature(body, signature):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid webhook signature",
-        )
+
+    # Verbose payload logging is skipped entirely below INFO (production)
+    log_info = logger.isEnabledFor(logging.INFO)
 
     try:
-        payload_dict = json.loads(body.decode())
-        payload = ChatCompletionPayload(**payload_dict)
+        payload = ChatCompletionPayload.model_validate_json(body)
+        
+        # Fields read repeatedly below are bound to locals once
+        bot_id, visitor_id, session_token = payload.bot_id, payload.visitor_id, payload.session_token
+        query, response = payload.query, payload.response
+        visitor_info, is_contact = payload.visitor_info, payload.is_contact
+        long_term_memory, session_summary = payload.long_term_memory, payload.session_summary
+        tokens_input, tokens_output, cost_usd = payload.tokens_input, payload.tokens_output, payload.cost_usd
         
         visitor_service = VisitorService(db)
         session = await visitor_service.create_or_find_session(
-            bot_id=payload.bot_id,
-            visitor_id=payload.visitor_id,
-            session_token=payload.session_token,
+            bot_id=bot_id,
+            visitor_id=visitor_id,
+            session_token=session_token,
         )
+        session_id = session.id
 
-        if payload.long_term_memory or payload.session_summary:
-            session_extra = session.extra_data.copy() if session.extra_data else {}
+        if long_term_memory or session_summary:
+            extra_patch = {}
             
-            if payload.long_term_memory:
-                session_extra["long_term_memory"] = payload.long_term_memory
-                logger.info(
-                    "Updating session long_term_memory",
-                    extra={
-                        "session_id": session.id,
-                        "session_token": payload.session_token,
-                        "memory_length": len(payload.long_term_memory),
-                        "memory_preview": payload.long_term_memory[:200] if len(payload.long_term_memory) > 200 else payload.long_term_memory,
-                    }
-                )
-            if payload.session_summary:
-                session_extra["session_summary"] = payload.session_summary
-                logger.info(
-                    "Updating session_summary",
-                    extra={
-                        "session_id": session.id,
-                        "session_token": payload.session_token,
-                        "summary_length": len(payload.session_summary),
-                    }
-                )
+            if long_term_memory:
+                extra_patch["long_term_memory"] = long_term_memory
+                if log_info:
+                    logger.info(
+                        "Updating session long_term_memory",
+                        extra={
+                            "session_id": session_id,
+                            "session_token": session_token,
+                            "memory_length": len(long_term_memory),
+                            "memory_preview": long_term_memory[:200] if len(long_term_memory) > 200 else long_term_memory,
+                        }
+                    )
+            if session_summary:
+                extra_patch["session_summary"] = session_summary
+                if log_info:
+                    logger.info(
+                        "Updating session_summary",
+                        extra={
+                            "session_id": session_id,
+                            "session_token": session_token,
+                            "summary_length": len(session_summary),
+                        }
+                    )
             
-            session.extra_data = session_extra
+            # Merge server-side with JSONB || instead of rewriting the whole dict
+            await db.execute(
+                update(ChatSession)
+                .where(ChatSession.id == session_id)
+                .values(extra_data=ChatSession.extra_data.op("||")(cast(extra_patch, JSONB)))
+                .execution_options(synchronize_session=False)
+            )
         
-        chat_message = ChatMessage(
-            session_id=session.id,
-            query=payload.query,
-            response=payload.response,
-            extra_data=payload.extra_data or {},
-        )
-        db.add(chat_message)
-
-        usage_log = UsageLog(
-            bot_id=payload.bot_id,
-            model_id=payload.model_id if payload.model_id else None,
-            session_id=session.id,
-            tokens_input=payload.tokens_input,
-            tokens_output=payload.tokens_output,
-            cost_usd=payload.cost_usd,
-        )
-        db.add(usage_log)
-
-        if payload.visitor_info:
+        if visitor_info:
             try:
-                logger.info(
-                    "Processing visitor_info from webhook",
-                    extra={
-                        "visitor_id": payload.visitor_id,
-                        "visitor_info": payload.visitor_info,
-                    }
-                )
-                
-                validated_info = VisitorInfoUpdate(**payload.visitor_info)
-                validated_dict = validated_info.model_dump(exclude_none=True)
+                if log_info:
+                    logger.info(
+                        "Processing visitor_info from webhook",
+                        extra={
+                            "visitor_id": visitor_id,
+                            "visitor_info": visitor_info,
+                        }
+                    )
                 
-                logger.info(
-                    "Validated visitor_info",
-                    extra={
-                        "visitor_id": payload.visitor_id,
-                        "validated_fields": list(validated_dict.keys()),
-                        "validated_info": validated_dict,
-                    }
-                )
+                validated_info = _VISITOR_INFO_VALIDATOR.validate_python(visitor_info)
+                validated_dict = _VISITOR_INFO_SERIALIZER.to_python(validated_info, exclude_none=True)
                 
-                updated = await visitor_service.update_visitor_info(
-                    visitor_id=payload.visitor_id,
-                    validated_info=validated_dict
-                )
-                if updated:
+                if log_info:
                     logger.info(
-                        "Updated visitor info from chat",
+                        "Validated visitor_info",
                         extra={
-                            "visitor_id": payload.visitor_id,
-                            "collected": list(validated_dict.keys()),
-                            "values": validated_dict,
+                            "visitor_id": visitor_id,
+                            "validated_fields": list(validated_dict.keys()),
+                            "validated_info": validated_dict,
                         }
                     )
+                
+                updated = await visitor_service.update_visitor_info(
+                    visitor_id=visitor_id,
+                    validated_info=validated_dict,
+                    flush=False
+                )
+                if updated:
+                    if log_info:
+                        logger.info(
+                            "Updated visitor info from chat",
+                            extra={
+                                "visitor_id": visitor_id,
+                                "collected": list(validated_dict.keys()),
+                                "values": validated_dict,
+                            }
+                        )
                 else:
                     logger.warning(
                         "Failed to update visitor info (no rows affected)",
                         extra={
-                            "visitor_id": payload.visitor_id,
+                            "visitor_id": visitor_id,
                             "attempted_fields": list(validated_dict.keys()),
                         }
                     )
@@ -178,89 +218,109 @@ async def chat_completion_webhook(
                 logger.warning(
                     "Invalid visitor info collected from chat",
                     extra={
-                        "visitor_id": payload.visitor_id,
+                        "visitor_id": visitor_id,
                         "errors": e.errors(),
-                        "raw_data": payload.visitor_info
+                        "raw_data": visitor_info
                     }
                 )
 
-        logger.info(
-            "WEBHOOK RECEIVED: Checking contact notification conditions",
-            extra={
-                "payload_is_contact": payload.is_contact,
-                "session_is_contact": session.is_contact,
-                "will_send_notification": payload.is_contact and not session.is_contact,
-                "session_id": session.id,
-                "visitor_id": payload.visitor_id,
-                "visitor_info": payload.visitor_info
-            }
-        )
-        
-        if payload.is_contact and not session.is_contact:
+        if log_info:
             logger.info(
-                "CONTACT NOTIFICATION: Triggering notification (is_contact: false -> true)",
+                "WEBHOOK RECEIVED: Checking contact notification conditions",
                 extra={
-                    "bot_id": payload.bot_id,
-                    "visitor_id": payload.visitor_id,
-                    "visitor_info": payload.visitor_info,
-                    "session_id": session.id
+                    "payload_is_contact": is_contact,
+                    "session_is_contact": session.is_contact,
+                    "will_send_notification": is_contact and not session.is_contact,
+                    "session_id": session_id,
+                    "visitor_id": visitor_id,
+                    "visitor_info": visitor_info
                 }
             )
-            try:
-                await visitor_service.handle_contact_request(
-                    bot_id=payload.bot_id,
-                    visitor_id=payload.visitor_id,
-                    visitor_info=payload.visitor_info,
-                    query=payload.query,
-                    response=payload.response,
-                    session_token=payload.session_token,
+        
+        if is_contact and not session.is_contact:
+            if log_info:
+                logger.info(
+                    "CONTACT NOTIFICATION: Triggering notification (is_contact: false -> true)",
+                    extra={
+                        "bot_id": bot_id,
+                        "visitor_id": visitor_id,
+                        "visitor_info": visitor_info,
+                        "session_id": session_id
+                    }
                 )
-                session.is_contact = True
+            # Set optimistically so duplicate webhooks don't notify twice;
+            # notifications and emails are sent after the response
+            session.is_contact = True
+            background_tasks.add_task(
+                _handle_contact_request_task,
+                bot_id=bot_id,
+                visitor_id=visitor_id,
+                visitor_info=visitor_info,
+                query=query,
+                response=response,
+                session_token=session_token,
+            )
+            if log_info:
                 logger.info(
-                    "CONTACT NOTIFICATION: Successfully updated is_contact to True",
+                    "CONTACT NOTIFICATION: Updated is_contact to True, notification scheduled",
                     extra={
-                        "session_id": session.id,
-                        "visitor_id": payload.visitor_id,
+                        "session_id": session_id,
+                        "visitor_id": visitor_id,
                     }
                 )
-            except Exception as e:
-                logger.error(
-                    f"CONTACT NOTIFICATION: Failed to handle contact request: {e}",
-                    exc_info=True,
-                    extra={"bot_id": payload.bot_id, "visitor_id": payload.visitor_id}
+        elif is_contact and session.is_contact:
+            if log_info:
+                logger.info(
+                    "CONTACT NOTIFICATION: Skipping - contact already collected for this session",
+                    extra={"session_id": session_id, "visitor_id": visitor_id}
+                )
+        elif not is_contact:
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "CONTACT NOTIFICATION: Skipping - is_contact is False",
+                    extra={"session_id": session_id, "visitor_id": visitor_id}
                 )
-        elif payload.is_contact and session.is_contact:
-            logger.info(
-                "CONTACT NOTIFICATION: Skipping - contact already collected for this session",
-                extra={"session_id": session.id, "visitor_id": payload.visitor_id}
-            )
-        elif not payload.is_contact:
-            logger.debug(
-                "CONTACT NOTIFICATION: Skipping - payload.is_contact is False",
-                extra={"session_id": session.id, "visitor_id": payload.visitor_id}
-            )
 
+        # All ORM writes are collected here and flushed once by the commit
+        db.add_all([
+            ChatMessage(
+                session_id=session_id,
+                query=query,
+                response=response,
+                extra_data=payload.extra_data or {},
+            ),
+            UsageLog(
+                bot_id=bot_id,
+                model_id=payload.model_id if payload.model_id else None,
+                session_id=session_id,
+                tokens_input=tokens_input,
+                tokens_output=tokens_output,
+                cost_usd=cost_usd,
+            ),
+        ])
 
         await db.commit()
         
-        logger.info(
-            "Chat completion processed successfully",
-            extra={
-                "session_token": payload.session_token,
-                "tokens": payload.tokens_input + payload.tokens_output,
-                "cost_usd": payload.cost_usd,
-                "is_contact": payload.is_contact,
-            }
-        )
+        if log_info:
+            logger.info(
+                "Chat completion processed successfully",
+                extra={
+                    "session_token": session_token,
+                    "tokens": tokens_input + tokens_output,
+                    "cost_usd": cost_usd,
+                    "is_contact": is_contact,
+                }
+            )
         
-        return WebhookResponse()
-    except json.JSONDecodeError as e:
-        logger.error(f"Invalid JSON in chat completion webhook: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid JSON payload",
-        )
+        # New Response per call: FastAPI attaches background tasks to the instance
+        return Response(content=_WEBHOOK_OK_BODY, media_type="application/json")
     except ValidationError as ve:
+        if any(error["type"] == "json_invalid" for error in ve.errors()):
+            logger.error(f"Invalid JSON in chat completion webhook: {ve}", exc_info=True)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid JSON payload",
+            )
         logger.error(f"Validation error in chat completion webhook: {ve}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -278,149 +338,230 @@ async def chat_completion_webhook(
 # File Server Webhooks - File Processing & Sitemap Crawl
 # ============================================================================
 
+async def _finish_task_side_effects(task_id: str, bot_id: str, success: bool, message: str) -> None:
+    """
+    Update the task notification and invalidate bot cache after the webhook has responded.
+    Document rows are already committed, so this only refreshes derived state.
+    
+    Args:
+        task_id: File-server task ID
+        bot_id: Bot UUID
+        success: Whether the task succeeded
+        message: Notification message
+    """
+    redis = redis_manager.get_redis()
+    log = ContextLoggerAdapter(logger, {"bot_id": bot_id, "task_id": task_id})
+
+    async def update_notification() -> None:
+        async with db_manager.session() as db:
+            await NotificationService(db, redis).update_task_notification(
+                task_id=task_id,
+                progress=100 if success else 0,
+                status="completed" if success else "failed",
+                message=message
+            )
+
+    # Independent best-effort steps, so run both round trips concurrently
+    notification_result, invalidation_result = await asyncio.gather(
+        update_notification(),
+        CacheInvalidation(redis).invalidate_bot(bot_id),
+        return_exceptions=True
+    )
+
+    if isinstance(notification_result, Exception):
+        log.error(
+            f"Failed to update task notification: {notification_result}",
+            exc_info=notification_result
+        )
+
+    if isinstance(invalidation_result, Exception):
+        log.error(
+            f"Failed to invalidate cache: {invalidation_result}",
+            exc_info=invalidation_result
+        )
+    elif log.isEnabledFor(logging.DEBUG):
+        log.debug(f"Invalidated cache for bot: {bot_id}")
+
+
+async def _claim_delivery(redis: Redis, signature: str) -> Optional[str]:
+    """
+    Mark a signed file-server delivery as in progress.
+    Retries resend the same body, so they carry the same signature.
+    
+    Args:
+        redis: Redis client
+        signature: Verified X-Webhook-Signature header
+        
+    Returns:
+        None if this request should process the delivery, otherwise the
+        existing state (_DELIVERY_PROCESSING or _DELIVERY_DONE)
+    """
+    key = CacheKeys.webhook_delivery(signature)
+    try:
+        if await redis.set(key, _DELIVERY_PROCESSING, nx=True, ex=settings.WEBHOOK_PROCESSING_TTL):
+            return None
+        # Marker may expire between SET and GET; the sender just retries again
+        return await redis.get(key) or _DELIVERY_PROCESSING
+    except Exception as e:
+        logger.warning(f"Failed to claim webhook delivery, processing anyway: {e}")
+        return None
+
+
+def _duplicate_delivery_response(state: str, path: str) -> Response:
+    """
+    Answer a delivery that is already claimed.
+    
+    Completed deliveries get the usual 200 so the sender stops. Deliveries
+    still in progress get a 409 so the sender retries; the first attempt
+    may yet fail and release its claim.
+    
+    Args:
+        state: Existing delivery state from _claim_delivery
+        path: Request path for logging
+        
+    Raises:
+        HTTPException: 409 if the delivery is still being processed
+    """
+    if state == _DELIVERY_DONE:
+        logger.info("Duplicate webhook delivery ignored", extra={"path": path})
+        return Response(content=_WEBHOOK_OK_BODY, media_type="application/json")
+    
+    logger.info("Webhook delivery still in progress, asking sender to retry", extra={"path": path})
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Delivery is already being processed",
+        headers={"Retry-After": str(_DELIVERY_RETRY_AFTER)}
+    )
+
+
+async def _complete_delivery(redis: Redis, signature: str) -> None:
+    """
+    Mark a delivery as done once its changes are committed.
+    
+    Args:
+        redis: Redis client
+        signature: Verified X-Webhook-Signature header
+    """
+    try:
+        await redis.set(
+            CacheKeys.webhook_delivery(signature),
+            _DELIVERY_DONE,
+            ex=settings.WEBHOOK_DELIVERY_TTL
+        )
+    except Exception as e:
+        logger.error(f"Failed to mark webhook delivery done: {e}")
+
+
+async def _release_delivery(redis: Redis, signature: str) -> None:
+    """
+    Forget a claimed delivery so the sender's retry is processed.
+    
+    Args:
+        redis: Redis client
+        signature: Verified X-Webhook-Signature header
+    """
+    try:
+        await redis.delete(CacheKeys.webhook_delivery(signature))
+    except Exception as e:
+        logger.error(f"Failed to release webhook delivery: {e}")
+
+
 @router.post(
     "/webhooks/file-processing-update",
     include_in_schema=False
 )
 async def file_processing_update(
     request: Request,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis)
+    redis: Redis = Depends(get_redis),
+    document_service: DocumentService = Depends(get_document_service)
 ):
     """
     **INTERNAL ONLY** - Webhook from file-server for file processing status updates.
     
     Updates document processing status and invalidates cache.
+    Signature is verified by WebhookSignatureMiddleware.
     Not exposed in API documentation.
     """
+    signature = request.headers.get("X-Webhook-Signature", "")
+    delivery_state = await _claim_delivery(redis, signature)
+    if delivery_state is not None:
+        return _duplicate_delivery_response(delivery_state, request.url.path)
+
     try:
-        signature = request.headers.get("X-Webhook-Signature")
-        if not signature:
-            logger.warning(
-                "Webhook received without signature",
-                extra={"client_ip": request.client.host}
-            )
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Missing webhook signature"
-            )
-        
         body = await request.body()
         
-        if not verify_webhook_signature(body, signature):
-            logger.warning(
-                "Invalid webhook signature",
-                extra={"client_ip": request.client.host}
-            )
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid webhook signature"
-            )
-        
-        payload_dict = json.loads(body.decode())
-        payload = FileProcessingUpdatePayload(**payload_dict)
+        payload = FileProcessingUpdatePayload.model_validate_json(body)
+        log = ContextLoggerAdapter(logger, {"bot_id": payload.bot_id, "task_id": payload.task_id})
 
-        logger.info(
+        log.info(
             f"File processing update received: task_id={payload.task_id}, success={payload.success}",
-            extra={
-                "task_id": payload.task_id,
-                "bot_id": payload.bot_id,
-                "success": payload.success,
-                "task_type": payload.task_type
-            }
+            extra={"success": payload.success, "task_type": payload.task_type}
         )
 
-        document_service = DocumentService(db, redis)
-
-        from app.services.notification import NotificationService
-        notification_service = NotificationService(db, redis)
-
         if payload.success and payload.metadata and payload.metadata.results:
-            for result in payload.metadata.results:
-                if result.document_id:
-                    try:
-                        await document_service.update_processing_result(
-                            document_id=result.document_id,
-                            success=result.success,
-                            chunks_count=result.chunks_count,
-                            error_message=result.error
-                        )
-                        logger.info(
-                            f"Updated document {result.document_id} status",
-                            extra={
-                                "document_id": result.document_id,
-                                "success": result.success,
-                                "chunks": result.chunks_count
-                            }
-                        )
-                    except HTTPException:
-                        logger.warning(
-                            f"Document {result.document_id} not found, skipping update",
-                            extra={"document_id": result.document_id}
-                        )
-                    except Exception as e:
-                        logger.error(
-                            f"Failed to update document {result.document_id}: {e}",
-                            extra={"document_id": result.document_id},
-                            exc_info=True
-                        )
+            results = [result for result in payload.metadata.results if result.document_id]
+            updated_ids = await document_service.update_processing_results(results)
+
+            for result in results:
+                # Compare parsed UUIDs so non-canonical IDs still match
+                try:
+                    found = uuid.UUID(result.document_id) in updated_ids
+                except (TypeError, ValueError):
+                    found = False
+                
+                if not found:
+                    log.warning(
+                        f"Document {result.document_id} not found, skipping update",
+                        extra={"document_id": result.document_id}
+                    )
         
         elif not payload.success and payload.error:
-            logger.warning(
+            log.warning(
                 f"File processing failed: {payload.error}",
-                extra={
-                    "bot_id": payload.bot_id,
-                    "task_id": payload.task_id,
-                    "error": payload.error
-                }
+                extra={"error": payload.error}
             )
 
-        try:
-            progress = 100 if payload.success else 0
-            task_status = "completed" if payload.success else "failed"
-            message = "Processing completed successfully" if payload.success else f"Processing failed: {payload.error}"
-
-            await notification_service.update_task_notification(
-                task_id=payload.task_id,
-                progress=progress,
-                status=task_status,
-                message=message
-            )
-        except Exception as e:
-            logger.error(f"Failed to update task notification: {e}", exc_info=True)
-
         await db.commit()
+        await _complete_delivery(redis, signature)
 
-        try:
-            cache = CacheInvalidation(redis)
-            await cache.invalidate_bot(payload.bot_id)
-            logger.debug(
-                f"Invalidated cache for bot: {payload.bot_id}",
-                extra={"bot_id": payload.bot_id}
-            )
-        except Exception as e:
-            logger.error(f"Failed to invalidate cache: {e}", exc_info=True)
-        
-        return WebhookResponse(
-            status="received",
+        background_tasks.add_task(
+            _finish_task_side_effects,
             task_id=payload.task_id,
-            message="Webhook processed successfully"
+            bot_id=payload.bot_id,
+            success=payload.success,
+            message="Processing completed successfully" if payload.success else f"Processing failed: {payload.error}"
         )
+        
+        return Response(content=_WEBHOOK_OK_BODY, media_type="application/json")
     
-    except json.JSONDecodeError as e:
+    except ValidationError as ve:
+        await _release_delivery(redis, signature)
+        if any(error["type"] == "json_invalid" for error in ve.errors()):
+            logger.error(
+                f"Invalid JSON in webhook payload: {ve}",
+                extra={"client_ip": request.client.host}
+            )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid JSON payload"
+            )
         logger.error(
-            f"Invalid JSON in webhook payload: {e}",
+            f"Validation error in webhook payload: {ve}",
             extra={"client_ip": request.client.host}
         )
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid JSON payload"
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid payload structure: {str(ve)}"
         )
     
     except HTTPException:
+        await _release_delivery(redis, signature)
         raise
     
     except Exception as e:
+        await _release_delivery(redis, signature)
         logger.error(
             f"Error processing webhook: {e}",
             extra={"client_ip": request.client.host},
@@ -458,168 +599,127 @@ async def file_processing_update(
 )
 async def sitemap_crawl_update_webhook(
     request: Request,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
     redis: Redis = Depends(get_redis)
-) -> WebhookResponse:
+) -> Response:
     """
     Receive sitemap crawl update webhook from file-server.
 
     This endpoint is called by file-server when a crawl task completes.
     It creates Document records for crawled pages and invalidates relevant caches.
+    Signature is verified by WebhookSignatureMiddleware.
     """
-    try:
-        signature = request.headers.get("X-Webhook-Signature")
-        if not signature:
-            logger.warning(
-                "Webhook received without signature",
-                extra={"client_ip": request.client.host}
-            )
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Missing webhook signature"
-            )
+    signature = request.headers.get("X-Webhook-Signature", "")
+    delivery_state = await _claim_delivery(redis, signature)
+    if delivery_state is not None:
+        return _duplicate_delivery_response(delivery_state, request.url.path)
 
+    try:
         body = await request.body()
 
-        if not verify_webhook_signature(body, signature):
-            logger.warning(
-                "Invalid webhook signature",
-                extra={"client_ip": request.client.host}
-            )
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid webhook signature"
-            )
+        payload = SitemapCrawlUpdatePayload.model_validate_json(body)
+        log = ContextLoggerAdapter(logger, {"bot_id": payload.bot_id, "task_id": payload.task_id})
 
-        payload_dict = json.loads(body.decode())
-        payload = SitemapCrawlUpdatePayload(**payload_dict)
-
-        logger.info(
+        log.info(
             f"Crawl update received: task_id={payload.task_id}, success={payload.success}",
-            extra={
-                "task_id": payload.task_id,
-                "bot_id": payload.bot_id,
-                "success": payload.success,
-                "task_type": payload.task_type
-            }
+            extra={"success": payload.success, "task_type": payload.task_type}
         )
 
-        from app.services.notification import NotificationService
-        notification_service = NotificationService(db, redis)
-
         if payload.success and payload.metadata and payload.metadata.crawled_pages:
-            logger.info(
+            log.info(
                 f"Creating Document records for {len(payload.metadata.crawled_pages)} crawled pages",
-                extra={
-                    "bot_id": payload.bot_id,
-                    "total_pages": len(payload.metadata.crawled_pages)
-                }
+                extra={"total_pages": len(payload.metadata.crawled_pages)}
             )
 
-            created_count = 0
-            failed_count = 0
-
-            for page in payload.metadata.crawled_pages:
-                if not page.success or not page.url:
-                    failed_count += 1
-                    continue
-
-                try:
-                    import hashlib
-                    from app.models.document import Document
-                    from app.common.enums import DocumentStatus
-
-                    content_hash = hashlib.sha256(page.url.encode('utf-8')).hexdigest()
-
-                    doc = Document(
-                        bot_id=payload.bot_id,
-                        url=page.url,
-                        title=page.title or page.url,
-                        content_hash=content_hash,
-                        status=DocumentStatus.COMPLETED,
-                        extra_data={
-                            "chunks_count": page.chunks_count,
-                            "task_id": payload.task_id,
-                            "crawled_at": payload.timestamp.isoformat()
+            valid_pages = [
+                page for page in payload.metadata.crawled_pages
+                if page.success and page.url
+            ]
+            failed_count = len(payload.metadata.crawled_pages) - len(valid_pages)
+
+            if valid_pages:
+                sha256 = _sha256
+                content_hashes = [sha256(page.url.encode('utf-8')).hexdigest() for page in valid_pages]
+
+                # ORM bulk INSERT skips mapper events, so timestamps are set here
+                created_at = now()
+                crawled_at = payload.timestamp.isoformat()
+                bot_id = payload.bot_id
+                task_id = payload.task_id
+                await db.execute(
+                    insert(Document),
+                    [
+                        {
+                            "bot_id": bot_id,
+                            "url": page.url,
+                            "title": page.title or page.url,
+                            "content_hash": content_hash,
+                            "status": DocumentStatus.COMPLETED,
+                            "extra_data": {
+                                "chunks_count": page.chunks_count,
+                                "task_id": task_id,
+                                "crawled_at": crawled_at
+                            },
+                            "created_at": created_at,
+                            "updated_at": created_at,
                         }
-                    )
-
-                    db.add(doc)
-                    created_count += 1
-
-                except Exception as e:
-                    logger.error(
-                        f"Failed to create document for URL {page.url}: {e}",
-                        extra={"url": page.url, "bot_id": payload.bot_id},
-                        exc_info=True
-                    )
-                    failed_count += 1
+                        for page, content_hash in zip(valid_pages, content_hashes)
+                    ]
+                )
+            created_count = len(valid_pages)
 
-            logger.info(
+            log.info(
                 f"Created {created_count} documents, {failed_count} failed",
-                extra={
-                    "bot_id": payload.bot_id,
-                    "created": created_count,
-                    "failed": failed_count
-                }
+                extra={"created": created_count, "failed": failed_count}
             )
         elif payload.success:
-            logger.warning(
-                f"Crawl successful but no crawled_pages in metadata",
-                extra={"bot_id": payload.bot_id, "task_id": payload.task_id}
-            )
+            log.warning("Crawl successful but no crawled_pages in metadata")
         else:
-            logger.warning(
+            log.warning(
                 f"Crawl failed: {payload.bot_id}, error: {payload.error}",
-                extra={"bot_id": payload.bot_id, "error": payload.error}
-            )
-
-        try:
-            progress = 100 if payload.success else 0
-            task_status = "completed" if payload.success else "failed"
-            message = "Crawl completed successfully" if payload.success else f"Crawl failed: {payload.error}"
-
-            await notification_service.update_task_notification(
-                task_id=payload.task_id,
-                progress=progress,
-                status=task_status,
-                message=message
+                extra={"error": payload.error}
             )
-        except Exception as e:
-            logger.error(f"Failed to update task notification: {e}", exc_info=True)
 
         await db.commit()
-        
-        try:
-            cache = CacheInvalidation(redis)
-            await cache.invalidate_bot(payload.bot_id)
-            logger.debug(
-                f"Invalidated cache for bot: {payload.bot_id}",
-                extra={"bot_id": payload.bot_id}
-            )
-        except Exception as e:
-            logger.error(f"Failed to invalidate cache: {e}", exc_info=True)
-        
-        return WebhookResponse(
-            status="received",
+        await _complete_delivery(redis, signature)
+
+        background_tasks.add_task(
+            _finish_task_side_effects,
             task_id=payload.task_id,
-            message="Webhook processed successfully"
+            bot_id=payload.bot_id,
+            success=payload.success,
+            message="Crawl completed successfully" if payload.success else f"Crawl failed: {payload.error}"
         )
+        
+        return Response(content=_WEBHOOK_OK_BODY, media_type="application/json")
     
-    except json.JSONDecodeError as e:
+    except ValidationError as ve:
+        await _release_delivery(redis, signature)
+        if any(error["type"] == "json_invalid" for error in ve.errors()):
+            logger.error(
+                f"Invalid JSON in webhook payload: {ve}",
+                extra={"client_ip": request.client.host}
+            )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid JSON payload"
+            )
         logger.error(
-            f"Invalid JSON in webhook payload: {e}",
+            f"Validation error in webhook payload: {ve}",
             extra={"client_ip": request.client.host}
         )
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid JSON payload"
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid payload structure: {str(ve)}"
         )
     
     except HTTPException:
+        await _release_delivery(redis, signature)
         raise
     
     except Exception as e:
+        await _release_delivery(redis, signature)
         logger.error(
             f"Error processing webhook: {e}",
             extra={"client_ip": request.client.host},
@@ -642,8 +742,8 @@ async def sitemap_crawl_update_webhook(
 )
 async def visitor_grading_webhook(
     request: Request,
-    payload: VisitorGradingWebhook,
     db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis),
 ):
     """
     **INTERNAL ONLY** - Webhook from visitor-grader after scoring/assessment completes.
@@ -652,25 +752,32 @@ async def visitor_grading_webhook(
     - Lead scoring (grading): Updates visitor lead score, sends hot lead notifications
     - Custom assessment: Stores assessment results in visitor extra_data
     
-    Security: HMAC signature required
+    Security: HMAC signature required (verified by WebhookSignatureMiddleware)
     """
+    body = await request.body()
+
     try:
-        body = await request.body()
-        signature = request.headers.get("X-Webhook-Signature", "")
-        
-        if not verify_webhook_signature(body, signature):
-            logger.warning(
-                "Invalid webhook signature",
-                extra={
-                    "endpoint": "/webhooks/visitor-grading",
-                    "visitor_id": payload.visitor_id
-                }
+        payload = VisitorGradingWebhook.model_validate_json(body)
+    except ValidationError as ve:
+        if any(error["type"] == "json_invalid" for error in ve.errors()):
+            logger.error(
+                f"Invalid JSON in webhook payload: {ve}",
+                extra={"endpoint": "/webhooks/visitor-grading"}
             )
             raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid webhook signature"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid JSON payload"
             )
-        
+        logger.error(
+            f"Validation error in webhook payload: {ve}",
+            extra={"endpoint": "/webhooks/visitor-grading"}
+        )
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Invalid payload structure: {str(ve)}"
+        )
+
+    try:
         task_type = payload.task_type or AssessmentTaskType.GRADING.value
         
         logger.info(
@@ -686,32 +793,35 @@ async def visitor_grading_webhook(
         visitor_service = VisitorService(db)
         
         if task_type == AssessmentTaskType.ASSESSMENT.value:
+            assessed_at = payload.assessed_at.isoformat() if payload.assessed_at else None
+            assessment_data = {
+                "results": _ASSESSMENT_RESULTS_ADAPTER.dump_python(payload.results or []),
+                "summary": payload.summary,
+                "assessed_at": assessed_at,
+                "model_used": payload.model_used,
+                "total_messages": payload.total_messages,
+            }
             await visitor_service.store_assessment_results(
                 visitor_id=payload.visitor_id,
-                assessment_data={
-                    "results": [r.model_dump() for r in (payload.results or [])],
-                    "summary": payload.summary,
-                    "assessed_at": payload.assessed_at.isoformat() if payload.assessed_at else None,
-                    "model_used": payload.model_used,
-                    "total_messages": payload.total_messages,
-                },
+                assessment_data=assessment_data,
                 lead_score=getattr(payload, 'lead_score', 0)
             )
 
-            redis_client = redis_manager.get_redis()
             active_key = CacheKeys.assessment_active(payload.visitor_id)
             lock_key = CacheKeys.assessment_lock(payload.visitor_id)
-            await redis_client.delete(active_key)
-            await redis_client.delete(lock_key)
-            
             channel = CacheKeys.task_progress_channel(payload.task_id)
-            await redis_client.publish(channel, json.dumps({
-                "status": "COMPLETED",
-                "task_id": payload.task_id,
-                "visitor_id": payload.visitor_id,
-                "lead_score": getattr(payload, 'lead_score', 0),
-                "summary": payload.summary,
-            }))
+            
+            # Release locks and notify SSE listeners in one round-trip
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.delete(active_key, lock_key)
+                pipe.publish(channel, orjson.dumps({
+                    "status": "COMPLETED",
+                    "task_id": payload.task_id,
+                    "visitor_id": payload.visitor_id,
+                    "lead_score": getattr(payload, 'lead_score', 0),
+                    "summary": payload.summary,
+                }))
+                await pipe.execute()
             logger.info(f"Published COMPLETED event to SSE channel: {channel}")
             
         else:
@@ -733,12 +843,10 @@ async def visitor_grading_webhook(
                 }
             )
             
-            redis_client = redis_manager.get_redis()
             lock_key = CacheKeys.grading_lock(payload.visitor_id)
-            await redis_client.delete(lock_key)
+            await redis.delete(lock_key)
 
-        message = f"Visitor {task_type} processed successfully"
-        return WebhookResponse(message=message)
+        return ORJSONResponse(content={"message": f"Visitor {task_type} processed successfully"})
     
     except HTTPException:
         raise
@@ -3,12 +3,17 @@ Widget API endpoints.
 Handles widget initialization and visitor session management.
 """
 from fastapi import APIRouter, Depends, HTTPException, Request, status, UploadFile, File
-from fastapi.responses import StreamingResponse, Response
+from fastapi.responses import StreamingResponse, Response, RedirectResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from redis.asyncio import Redis
-from typing import Optional
+from typing import Any, Optional
 import io
+import orjson
 
+from app.cache.invalidation import CacheInvalidation
+from app.cache.keys import CacheKeys
+from app.cache.service import CacheService
+from app.config.settings import settings
 from app.core.database import get_db
 from app.core.dependencies import get_redis, Root
 from app.schemas.widget import (
@@ -28,18 +33,53 @@ from app.services.widget import widget_service
 from app.common.enums import TaskStatus
 from app.common.constants import WidgetFile
 from app.utils.logging import get_logger
-from app.utils.request_utils import get_client_ip
+from app.utils.request_utils import get_client_ip, compute_etag, etag_matches, accepts_encoding
 
 router = APIRouter()
 logger = get_logger(__name__)
 
+# Defaults dumped once; bots without a stored display_config reuse it
+_DEFAULT_DISPLAY_CONFIG_DICT = DisplayConfig().model_dump()
+
+# Stored under the widget config key for unknown bots; never valid JSON config
+_MISSING_BOT = "missing"
+
+
+def _pluck(data: dict, *keys: str) -> Optional[Any]:
+    """Walk nested dicts by keys, returning None as soon as a level is missing."""
+    for key in keys:
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _config_response(request: Request, body: bytes) -> Response:
+    """
+    Answer with encoded widget config, or 304 when the client's ETag matches.
+    
+    Args:
+        request: Incoming request (for If-None-Match)
+        body: orjson-encoded WidgetConfigResponse
+        
+    Returns:
+        304 response or JSON response carrying an ETag
+    """
+    etag = compute_etag(body)
+    
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
 
 @router.get("/config/{bot_id}", response_model=WidgetConfigResponse)
 async def get_widget_config(
     bot_id: str,
+    request: Request,
     db: AsyncSession = Depends(get_db),
     redis: Redis = Depends(get_redis),
-) -> WidgetConfigResponse:
+) -> Response:
     """
     Get widget configuration for a specific bot.
     
@@ -52,71 +92,65 @@ async def get_widget_config(
     - Branding (company name, logo, powered by)
     
     This is called when widget first loads to get styling/config.
+    Responses carry an ETag; a matching If-None-Match gets 304 Not Modified.
     """
     try:
+        cache = CacheService(redis)
+        cache_key = CacheKeys.widget_config(bot_id)
+        # Stored pre-encoded, so a hit skips both json.loads and re-serialization
+        cached_body = await cache.get(cache_key, as_json=False)
+        if cached_body == _MISSING_BOT:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Bot not found"
+            )
+        if cached_body:
+            return _config_response(request, cached_body.encode())
+        
         bot_service = BotService(db, redis)
-        bot = await bot_service.get_by_id(bot_id)
+        bot = await bot_service.get_widget_fields(bot_id)
         
         if not bot:
+            # Negative cache so unknown IDs from misconfigured embeds don't hit Postgres each load
+            await cache.set(cache_key, _MISSING_BOT, ttl=settings.CACHE_WIDGET_MISSING_TTL, as_json=False)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Bot not found"
             )
         
 
-        display_config_dict = bot.display_config or {}
-        
-        try:
-            if display_config_dict:
-                display_config = DisplayConfig(**display_config_dict)
-            else:
-                display_config = DisplayConfig()
-            
-            display_config_dict = display_config.model_dump()
-        except Exception as e:
-            logger.warning(
-                f"Failed to parse display_config, using defaults: {e}",
-                extra={"bot_id": bot_id}
-            )
-            
-            display_config = DisplayConfig()
-            display_config_dict = display_config.model_dump()
-        
-        welcome_msg = None
-        header_title = None
-        header_subtitle = None
-        avatar_url = None
-        placeholder = None
-        primary_color = None
+        display_config_dict = _DEFAULT_DISPLAY_CONFIG_DICT
         
-        if "welcome_message" in display_config_dict:
-            welcome_msg = display_config_dict["welcome_message"].get("message")
+        if bot.display_config:
+            try:
+                display_config_dict = DisplayConfig.model_validate(bot.display_config).model_dump()
+            except Exception as e:
+                logger.warning(
+                    f"Failed to parse display_config, using defaults: {e}",
+                    extra={"bot_id": bot_id}
+                )
         
-        if "header" in display_config_dict:
-            header_title = display_config_dict["header"].get("title")
-            header_subtitle = display_config_dict["header"].get("subtitle")
-            avatar_url = display_config_dict["header"].get("avatar_url")
+        header = display_config_dict.get("header") or {}
         
-        if "input" in display_config_dict:
-            placeholder = display_config_dict["input"].get("placeholder")
-        
-        if "colors" in display_config_dict and "header" in display_config_dict["colors"]:
-            primary_color = display_config_dict["colors"]["header"].get("background")
-        
-        return WidgetConfigResponse(
+        config_response = WidgetConfigResponse(
             bot_id=str(bot.id),
             bot_name=bot.name,
             bot_key=bot.bot_key,
             language=bot.language,
             display_config=display_config_dict,
-            welcome_message=welcome_msg,
-            header_title=header_title,
-            header_subtitle=header_subtitle,
-            avatar_url=avatar_url,
-            placeholder=placeholder,
-            primary_color=primary_color
+            welcome_message=_pluck(display_config_dict, "welcome_message", "message"),
+            header_title=header.get("title"),
+            header_subtitle=header.get("subtitle"),
+            avatar_url=header.get("avatar_url"),
+            placeholder=_pluck(display_config_dict, "input", "placeholder"),
+            primary_color=_pluck(display_config_dict, "colors", "header", "background")
         )
         
+        body = orjson.dumps(config_response.model_dump(mode="json"))
+        await cache.set(cache_key, body, ttl=settings.CACHE_WIDGET_CONFIG_TTL, as_json=False)
+        
+        return _config_response(request, body)
+        
     except HTTPException:
         raise
     except Exception as e:
@@ -160,15 +194,9 @@ async def initialize_widget(
             "referrer": referer,
         }
         
-        visitor = await visitor_service.find_or_create_visitor(
+        visitor, session = await visitor_service.init_visitor_session(
             bot_id=payload.bot_id,
             ip_address=client_ip,
-            extra_data=extra_data
-        )
-        
-        session = await visitor_service.create_or_find_session(
-            bot_id=payload.bot_id,
-            visitor_id=str(visitor.id),
             session_token=payload.session_token,
             extra_data=extra_data
         )
@@ -258,9 +286,8 @@ async def widget_chat(
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         logger.error(
-            f"Widget chat failed: {str(e)}\n{traceback.format_exc()}",
+            f"Widget chat failed: {e}",
             extra={"session_token": payload.session_token, "error": str(e)},
             exc_info=True
         )
@@ -275,6 +302,7 @@ async def upload_widget_file(
     request: Request,
     file: UploadFile = File(...),
     version: Optional[str] = None,
+    redis: Redis = Depends(get_redis),
 ) -> dict:
     """
     Upload widget JavaScript file to MinIO.
@@ -289,15 +317,19 @@ async def upload_widget_file(
     The file will be stored in MinIO public bucket and served via CDN.
     """
     try:
-        content = await file.read()
-        file_size = len(content)
+        # Stream the spooled upload straight to MinIO instead of reading it into memory
+        file_size = file.size
+        if file_size is None:
+            file_size = file.file.seek(0, io.SEEK_END)
+        file.file.seek(0)
         
         uploaded_keys = widget_service.upload_widget(
-            file_data=io.BytesIO(content),
+            file_data=file.file,
             filename=file.filename,
             file_size=file_size,
             version=version
         )
+        await CacheInvalidation(redis).invalidate_widget()
         
         # Get base URL from request
         base_url = f"{request.url.scheme}://{request.url.netloc}"
@@ -339,14 +371,18 @@ async def upload_widget_file(
 
 
 @router.get("/admin/list", dependencies=[Depends(Root)])
-async def list_widget_files() -> dict:
+async def list_widget_files(redis: Redis = Depends(get_redis)) -> dict:
     """
     List all uploaded widget files in MinIO.
     
     **Root user only.**
     """
     try:
-        files = widget_service.list_widgets()
+        cache = CacheService(redis)
+        files = await cache.get(CacheKeys.widget_files())
+        if files is None:
+            files = widget_service.list_widgets()
+            await cache.set(CacheKeys.widget_files(), files, ttl=settings.CACHE_WIDGET_FILES_TTL)
         
         return {
             "success": True,
@@ -367,7 +403,10 @@ async def list_widget_files() -> dict:
 
 
 @router.delete("/admin/delete/{filename:path}", dependencies=[Depends(Root)])
-async def delete_widget_file(filename: str) -> dict:
+async def delete_widget_file(
+    filename: str,
+    redis: Redis = Depends(get_redis),
+) -> dict:
     """
     Delete a widget file from MinIO.
     
@@ -377,6 +416,7 @@ async def delete_widget_file(filename: str) -> dict:
     """
     try:
         widget_service.delete_widget(filename)
+        await CacheInvalidation(redis).invalidate_widget()
         
         return {
             "success": True,
@@ -406,7 +446,7 @@ async def delete_widget_file(filename: str) -> dict:
 
 
 @router.get("/js")
-async def serve_widget_js(v: Optional[str] = None):
+async def serve_widget_js(request: Request, v: Optional[str] = None):
     """
     Serve widget JavaScript file from MinIO.
     
@@ -420,25 +460,46 @@ async def serve_widget_js(v: Optional[str] = None):
     - GET /api/v1/widget/js?v=1.0.0           → Specific version
     
     This endpoint:
-    1. Fetches widget.js from MinIO public bucket
+    1. Fetches widget.js from MinIO, or redirects to the MinIO public bucket
+       when WIDGET_JS_REDIRECT is enabled (missing versions then 404 at MinIO)
     2. Sets proper cache headers for Cloudflare CDN
-    3. Returns JavaScript content
+    3. Returns JavaScript content, pre-gzipped when the client accepts gzip
     """
     try:
-        content = widget_service.get_widget(version=v)
-        
         is_versioned = v is not None
         cache_control = widget_service.get_cache_control(is_versioned)
         
+        if settings.WIDGET_JS_REDIRECT:
+            return RedirectResponse(
+                url=widget_service.get_storage_url(version=v),
+                status_code=status.HTTP_302_FOUND,
+                headers={
+                    "Cache-Control": cache_control,
+                    "Access-Control-Allow-Origin": "*",
+                    "X-Widget-Version": v or "latest"
+                }
+            )
+        
+        encoding = "gzip" if accepts_encoding(request, "gzip") else None
+        content, etag = widget_service.get_widget_cached(version=v, encoding=encoding)
+        headers = {
+            "Cache-Control": cache_control,
+            "Access-Control-Allow-Origin": "*",
+            "X-Content-Type-Options": "nosniff",
+            "X-Widget-Version": v or "latest",
+            "ETag": etag,
+            "Vary": "Accept-Encoding"
+        }
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        
+        if etag_matches(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
         return Response(
             content=content,
             media_type="application/javascript",
-            headers={
-                "Cache-Control": cache_control,
-                "Access-Control-Allow-Origin": "*",
-                "X-Content-Type-Options": "nosniff",
-                "X-Widget-Version": v or "latest"
-            }
+            headers=headers
         )
         
     except FileNotFoundError as e:
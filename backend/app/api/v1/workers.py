@@ -1,10 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from redis.asyncio import Redis
 from uuid import UUID
 
-from app.core.database import get_db, get_redis
-from app.core.dependencies import Admin
+from app.core.database import get_db
+from app.core.dependencies import Admin, get_worker_service
 from app.common.types import CurrentUser
 from app.services.worker import WorkerService
 from app.schemas.worker import (
@@ -26,7 +25,7 @@ async def create_or_update_worker(
     bot_id: UUID,
     worker_data: BotWorkerCreate,
     db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis),
+    worker_service: WorkerService = Depends(get_worker_service),
     current_user: CurrentUser = Depends(Admin)
 ):
     """
@@ -37,8 +36,6 @@ async def create_or_update_worker(
     
     **Required role:** admin, root
     """
-    worker_service = WorkerService(db, redis)
-    
     try:
         worker = await worker_service.create_or_update(
             bot_id=bot_id,
@@ -67,16 +64,13 @@ async def create_or_update_worker(
 @router.get("/{bot_id}/workers", response_model=BotWorkerListResponse, dependencies=[Depends(Admin)])
 async def list_workers(
     bot_id: UUID,
-    db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis)
+    worker_service: WorkerService = Depends(get_worker_service)
 ):
     """
     Get all workers configured for a bot.
     
     **Required role:** admin, root
     """
-    worker_service = WorkerService(db, redis)
-    
     try:
         workers = await worker_service.get_all(bot_id)
         return BotWorkerListResponse(workers=workers)
@@ -88,16 +82,13 @@ async def list_workers(
 async def get_worker(
     bot_id: UUID,
     schedule_type: ScheduleType,
-    db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis)
+    worker_service: WorkerService = Depends(get_worker_service)
 ):
     """
     Get specific worker configuration by schedule type.
     
     **Required role:** admin, root
     """
-    worker_service = WorkerService(db, redis)
-    
     try:
         worker = await worker_service.get_by_type(bot_id, schedule_type)
         return worker
@@ -111,7 +102,7 @@ async def update_worker(
     schedule_type: ScheduleType,
     worker_data: BotWorkerUpdate,
     db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis),
+    worker_service: WorkerService = Depends(get_worker_service),
     current_user: CurrentUser = Depends(Admin)
 ):
     """
@@ -119,8 +110,6 @@ async def update_worker(
     
     **Required role:** admin, root
     """
-    worker_service = WorkerService(db, redis)
-    
     try:
         worker = await worker_service.update(
             bot_id=bot_id,
@@ -151,7 +140,7 @@ async def delete_worker(
     bot_id: UUID,
     schedule_type: ScheduleType,
     db: AsyncSession = Depends(get_db),
-    redis: Redis = Depends(get_redis),
+    worker_service: WorkerService = Depends(get_worker_service),
     current_user: CurrentUser = Depends(Admin)
 ):
     """
@@ -159,8 +148,6 @@ async def delete_worker(
     
     **Required role:** admin, root
     """
-    worker_service = WorkerService(db, redis)
-    
     try:
         await worker_service.delete(
             bot_id=bot_id,
@@ -1,6 +1,7 @@
-from app.cache.service import CacheService
+from app.cache.service import CacheService, InvalidationBuffer
 from app.cache.keys import CacheKeys
 from app.cache.invalidation import CacheInvalidation
+from app.cache.listener import LocalCacheListener, local_cache_listener
 
-__all__ = ["CacheService", "CacheKeys", "CacheInvalidation"]
+__all__ = ["CacheService", "InvalidationBuffer", "CacheKeys", "CacheInvalidation", "LocalCacheListener", "local_cache_listener"]
 
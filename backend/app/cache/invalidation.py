@@ -3,6 +3,7 @@ Cache invalidation rules per entity.
 Defines which cache keys need to be invalidated when entities are modified.
 """
 
+import asyncio
 from typing import List
 from redis.asyncio import Redis
 
@@ -21,6 +22,23 @@ class CacheInvalidation:
     def __init__(self, redis: Redis):
         self.cache = CacheService(redis)
     
+    async def _broadcast(self, entity: str, entity_id: str) -> None:
+        """
+        Tell every worker to drop in-process caches for an entity.
+        Handled by LocalCacheListener hooks.
+        
+        Args:
+            entity: Entity name
+            entity_id: Entity ID, or "" for all entities of that kind
+        """
+        try:
+            await self.cache.redis.publish(
+                CacheKeys.cache_invalidation_channel(),
+                f"{entity}:{entity_id}"
+            )
+        except Exception as e:
+            logger.error(f"Failed to broadcast {entity} invalidation: {e}")
+    
     async def invalidate_user(self, user_id: str) -> None:
         """
         Invalidate user-related cache.
@@ -28,16 +46,10 @@ class CacheInvalidation:
         Args:
             user_id: User UUID
         """
-        keys_to_delete = [
-            CacheKeys.user(user_id),
-        ]
-        
-        for key in keys_to_delete:
-            await self.cache.delete(key)
-        
-        # Invalidate user lists
-        await self.cache.delete_pattern("users:list:*")
+        # Nothing caches users lists, so only the user key is dropped
+        await self.cache.delete_many([CacheKeys.user(user_id)])
         
+        await self._broadcast("user", user_id)
         logger.info(f"Invalidated cache for user: {user_id}")
     
     async def invalidate_bot(self, bot_id: str) -> None:
@@ -52,57 +64,52 @@ class CacheInvalidation:
             CacheKeys.bot_config(bot_id),
             CacheKeys.bot_service_config(bot_id),
             CacheKeys.bot_origins(bot_id),
+            CacheKeys.widget_config(bot_id),
+            CacheKeys.analytics_bot(bot_id),
+            CacheKeys.stats_summary(),
         ]
         
-        for key in keys_to_delete:
-            await self.cache.delete(key)
-        
-        # Invalidate bot lists and analytics
-        await self.cache.delete_pattern("bots:list:*")
-        await self.cache.delete_pattern(CacheKeys.bot_pattern(bot_id))
-        await self.cache.delete(CacheKeys.analytics_bot(bot_id))
+        await self.cache.delete_keys_and_patterns(keys_to_delete, [CacheKeys.bot_pattern(bot_id)])
         
+        await self._broadcast("bot", bot_id)
         logger.info(f"Invalidated cache for bot: {bot_id}")
     
-    async def invalidate_document(self, document_id: str, bot_id: str) -> None:
+    async def invalidate_document(self, document_id: str) -> None:
         """
         Invalidate document-related cache.
         
         Args:
             document_id: Document UUID
-            bot_id: Associated bot UUID
         """
-        keys_to_delete = [
-            CacheKeys.document(document_id),
-        ]
+        # Nothing caches per-bot document lists, so only the document key is dropped
+        await self.cache.delete_many([CacheKeys.document(document_id)])
         
-        for key in keys_to_delete:
-            await self.cache.delete(key)
+        await self._broadcast("document", document_id)
+        logger.info(f"Invalidated cache for document: {document_id}")
+    
+    async def invalidate_documents(self, document_ids: List[str]) -> None:
+        """
+        Invalidate cache for a batch of documents.
         
-        # Invalidate bot's document lists
-        await self.cache.delete_pattern(f"bot:{bot_id}:documents:*")
+        Args:
+            document_ids: Document UUIDs
+        """
+        await self.cache.delete_many([CacheKeys.document(document_id) for document_id in document_ids])
         
-        logger.info(f"Invalidated cache for document: {document_id}")
+        await self._broadcast("document", "")
+        logger.info(f"Invalidated cache for {len(document_ids)} documents")
     
-    async def invalidate_visitor(self, visitor_id: str, bot_id: str) -> None:
+    async def invalidate_visitor(self, visitor_id: str) -> None:
         """
         Invalidate visitor-related cache.
         
         Args:
             visitor_id: Visitor UUID
-            bot_id: Associated bot UUID
         """
-        keys_to_delete = [
-            CacheKeys.visitor(visitor_id),
-        ]
-        
-        for key in keys_to_delete:
-            await self.cache.delete(key)
-        
-        # Invalidate visitor lists
-        await self.cache.delete_pattern(f"bot:{bot_id}:visitors:*")
-        await self.cache.delete_pattern("visitors:list:*")
+        # Nothing caches visitor lists, so only the visitor key is dropped
+        await self.cache.delete_many([CacheKeys.visitor(visitor_id)])
         
+        await self._broadcast("visitor", visitor_id)
         logger.info(f"Invalidated cache for visitor: {visitor_id}")
     
     async def invalidate_session(self, session_id: str) -> None:
@@ -112,7 +119,8 @@ class CacheInvalidation:
         Args:
             session_id: Session UUID
         """
-        await self.cache.delete(CacheKeys.session(session_id))
+        await self.cache.delete_many([CacheKeys.session(session_id)])
+        await self._broadcast("session", session_id)
         logger.info(f"Invalidated cache for session: {session_id}")
     
     async def invalidate_provider(self, provider_id: str) -> None:
@@ -122,16 +130,16 @@ class CacheInvalidation:
         Args:
             provider_id: Provider UUID
         """
+        # providers_list has only two variants, so delete them by name instead of scanning
         keys_to_delete = [
             CacheKeys.provider(provider_id),
+            CacheKeys.providers_list(),
+            CacheKeys.providers_list(include_deleted=True),
         ]
         
-        for key in keys_to_delete:
-            await self.cache.delete(key)
-        
-        # Invalidate provider lists
-        await self.cache.delete_pattern("providers:list:*")
+        await self.cache.delete_many(keys_to_delete)
         
+        await self._broadcast("provider", provider_id)
         logger.info(f"Invalidated cache for provider: {provider_id}")
     
     async def invalidate_model(self, model_id: str, provider_id: str) -> None:
@@ -146,12 +154,10 @@ class CacheInvalidation:
             CacheKeys.model(model_id),
         ]
         
-        for key in keys_to_delete:
-            await self.cache.delete(key)
-        
-        # Invalidate model lists
-        await self.cache.delete_pattern("models:list:*")
+        # Invalidate model lists in the same UNLINK
+        await self.cache.delete_keys_and_patterns(keys_to_delete, ["models:list:*"])
         
+        await self._broadcast("model", model_id)
         logger.info(f"Invalidated cache for model: {model_id}")
     
     async def invalidate_analytics(self, bot_id: str = None) -> None:
@@ -162,12 +168,15 @@ class CacheInvalidation:
             bot_id: Optional bot UUID for bot-specific analytics
         """
         if bot_id:
-            await self.cache.delete(CacheKeys.analytics_bot(bot_id))
-            await self.cache.delete_pattern(f"analytics:usage:bot:{bot_id}:*")
+            await self.cache.delete_keys_and_patterns(
+                [CacheKeys.analytics_bot(bot_id)],
+                [f"analytics:usage:bot:{bot_id}:*"]
+            )
         else:
-            await self.cache.delete(CacheKeys.analytics_overview())
+            # "analytics:*" already covers the overview key
             await self.cache.delete_pattern("analytics:*")
         
+        await self._broadcast("analytics", bot_id or "")
         logger.info(f"Invalidated analytics cache{f' for bot: {bot_id}' if bot_id else ''}")
     
     async def invalidate_notifications(self, user_id: str) -> None:
@@ -183,25 +192,30 @@ class CacheInvalidation:
             CacheKeys.notification_count(user_id),
         ]
         
-        for key in keys_to_delete:
-            await self.cache.delete(key)
+        await self.cache.delete_many(keys_to_delete)
         
+        await self._broadcast("notification", user_id)
         logger.info(f"Invalidated notification cache for user: {user_id}")
     
     async def invalidate_all_lists(self) -> None:
         """
         Invalidate all list caches (useful after bulk operations).
         """
-        patterns = [
-            "users:list:*",
-            "bots:list:*",
-            "visitors:list:*",
-            "providers:list:*",
-            "models:list:*",
-        ]
-        
-        for pattern in patterns:
-            await self.cache.delete_pattern(pattern)
+        await asyncio.gather(
+            self.cache.delete_many([
+                CacheKeys.providers_list(),
+                CacheKeys.providers_list(include_deleted=True),
+            ]),
+            self.cache.delete_pattern("models:list:*")
+        )
         
+        await self._broadcast("lists", "")
         logger.info("Invalidated all list caches")
-
+    
+    async def invalidate_widget(self) -> None:
+        """
+        Invalidate the widget file listing and widget.js content cached in every worker.
+        """
+        await self.cache.delete_many([CacheKeys.widget_files()])
+        await self._broadcast("widget", "")
+        logger.info("Invalidated widget file cache")
@@ -59,6 +59,16 @@ class CacheKeys:
         """Cache key for bot allowed origins."""
         return f"bot:{bot_id}:origins"
     
+    @staticmethod
+    def widget_config(bot_id: str) -> str:
+        """Cache key for public widget config response."""
+        return f"bot:{bot_id}:widget_config"
+    
+    @staticmethod
+    def widget_files() -> str:
+        """Cache key for admin listing of uploaded widget files."""
+        return "widget:files"
+    
     @staticmethod
     def allowed_origins(bot_key: str) -> str:
         """Cache key for bot allowed origins by bot_key (used by CORS middleware)."""
@@ -92,6 +102,16 @@ class CacheKeys:
         deleted_key = ":with_deleted" if include_deleted else ""
         return f"providers:list{deleted_key}"
     
+    @staticmethod
+    def active_providers() -> str:
+        """Cache key for active providers list (bot configuration)."""
+        return "providers:active"
+    
+    @staticmethod
+    def active_models(provider_id: str) -> str:
+        """Cache key for active models of a provider (bot configuration)."""
+        return f"providers:{provider_id}:models:active"
+    
     @staticmethod
     def models_list(provider_id: str = "", model_type: str = "") -> str:
         """Cache key for models list."""
@@ -109,6 +129,11 @@ class CacheKeys:
         """Cache key for bot-specific analytics."""
         return f"analytics:bot:{bot_id}"
     
+    @staticmethod
+    def stats_summary() -> str:
+        """Cache key for dashboard summary statistics."""
+        return "stats:summary"
+    
     @staticmethod
     def analytics_usage(bot_id: str = "", period: str = "day") -> str:
         """Cache key for usage statistics."""
@@ -218,11 +243,24 @@ class CacheKeys:
         """Sorted set of active task IDs with timestamp as score."""
         return "tasks:active:index"
     
+    @staticmethod
+    def webhook_delivery(signature: str) -> str:
+        """
+        State of a signed webhook delivery: "processing" while it is handled
+        (TTL: WEBHOOK_PROCESSING_TTL), then "done" once committed (TTL: WEBHOOK_DELIVERY_TTL).
+        """
+        return f"webhook:delivery:{signature}"
+    
     @staticmethod
     def task_progress_channel(task_id: str) -> str:
         """Pub/Sub channel for task progress updates (chat/grading/assessment/etc) via SSE."""
         return f"progress:{task_id}"
     
+    @staticmethod
+    def cache_invalidation_channel() -> str:
+        """Pub/Sub channel telling workers to drop in-process caches."""
+        return "cache:invalidate"
+    
     @staticmethod
     def task_cancel_channel(session_id: str) -> str:
         """Pub/Sub channel for task cancellation signals."""
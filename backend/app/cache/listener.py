@@ -0,0 +1,108 @@
+"""
+Cross-worker invalidation of in-process caches.
+CacheInvalidation publishes "<entity>:<id>" on a Redis channel; every worker
+subscribes and runs the hooks registered for that entity.
+"""
+import asyncio
+from typing import Callable, Dict, List, Optional
+
+from app.cache.keys import CacheKeys
+from app.core.database import redis_manager
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class LocalCacheListener:
+    """
+    Listens to the cache invalidation channel and drops local caches.
+    """
+
+    def __init__(self):
+        self.listener_task: Optional[asyncio.Task] = None
+        self._running = False
+        self._hooks: Dict[str, List[Callable[[str], None]]] = {}
+
+    def register(self, entity: str, hook: Callable[[str], None]) -> None:
+        """
+        Register a hook that drops local cache entries for an entity.
+
+        Args:
+            entity: Entity name used by CacheInvalidation (e.g. "bot", "widget")
+            hook: Callable receiving the invalidated entity ID ("" for all)
+        """
+        self._hooks.setdefault(entity, []).append(hook)
+
+    async def start(self):
+        """Start the invalidation listener background task."""
+        if self._running:
+            logger.warning("Local cache listener already running")
+            return
+
+        self._running = True
+        self.listener_task = asyncio.create_task(self._listen_loop())
+        logger.info("Local cache listener started")
+
+    async def stop(self):
+        """Stop the invalidation listener background task."""
+        self._running = False
+
+        if self.listener_task:
+            self.listener_task.cancel()
+            try:
+                await self.listener_task
+            except asyncio.CancelledError:
+                pass
+
+        logger.info("Local cache listener stopped")
+
+    async def _listen_loop(self):
+        """Subscribe to the invalidation channel and dispatch messages to hooks."""
+        redis = redis_manager.get_redis()
+        channel = CacheKeys.cache_invalidation_channel()
+
+        try:
+            pubsub = redis.pubsub()
+            await pubsub.subscribe(channel)
+
+            logger.info(f"Subscribed to cache invalidation channel ({channel})")
+
+            while self._running:
+                try:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+
+                    if message and message["type"] == "message":
+                        self._dispatch(message["data"])
+
+                except asyncio.CancelledError:
+                    break
+                except Exception as e:
+                    logger.error(f"Error processing cache invalidation message: {e}", exc_info=True)
+                    await asyncio.sleep(0.1)
+
+            await pubsub.unsubscribe(channel)
+            await pubsub.close()
+
+        except asyncio.CancelledError:
+            logger.info("Local cache listener cancelled")
+        except Exception as e:
+            logger.error(f"Local cache listener error: {e}", exc_info=True)
+
+    def _dispatch(self, data: str) -> None:
+        """
+        Run the hooks registered for an "<entity>:<id>" message.
+
+        Args:
+            data: Message payload
+        """
+        entity, _, entity_id = data.partition(":")
+
+        for hook in self._hooks.get(entity, ()):
+            try:
+                hook(entity_id)
+            except Exception as e:
+                logger.error(f"Local cache hook failed for {entity}: {e}", exc_info=True)
+
+
+# Singleton instance
+local_cache_listener = LocalCacheListener()
@@ -1,12 +1,144 @@
-from typing import Optional, Any, List
+from typing import Optional, Any, List, Tuple, Union
+from collections import OrderedDict
+from contextvars import ContextVar
+from fnmatch import fnmatchcase
+import asyncio
 import json
+import time
+import orjson
 from redis.asyncio import Redis
 
+from app.cache.keys import CacheKeys
+from app.cache.listener import local_cache_listener
 from app.config.settings import settings
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Datetimes pass through to default=str so cached values keep the same format
+# the stdlib encoder produced ("2024-01-01 00:00:00+00:00")
+_ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def _dumps(value: Any) -> Union[bytes, str]:
+    """
+    Serialize a cache value with orjson, falling back to the stdlib for unsupported input.
+    orjson's bytes go to Redis as-is, skipping a decode/encode round trip.
+    bytes input is treated as already-encoded JSON and passed through; str is
+    still encoded so get(as_json=True) returns the same str.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return value
+    try:
+        return orjson.dumps(value, default=str, option=_ORJSON_OPTIONS)
+    except TypeError:
+        return json.dumps(value, ensure_ascii=False, default=str)
+
+
+# Keys per UNLINK command; SCAN pages use settings.CACHE_SCAN_COUNT
+UNLINK_BATCH_SIZE = 500
+
+# One SCAN page plus UNLINK of its matches per call. The cursor loop stays
+# client-side so no single script blocks Redis for a whole keyspace walk.
+SCAN_UNLINK_SCRIPT = """
+local page = redis.call('SCAN', ARGV[1], 'MATCH', ARGV[2], 'COUNT', ARGV[3])
+local deleted = 0
+if #page[2] > 0 then
+    deleted = redis.call('UNLINK', unpack(page[2]))
+end
+return {page[1], deleted}
+"""
+
+# Fixed-window counter: INCR and arm the window expiry on the first hit only
+RATE_LIMIT_SCRIPT = """
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('PEXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+
+
+# L1: key -> (expires_at, decoded value); per-process LRU for get(local=True)
+_local_cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+
+def _drop_local(keys) -> None:
+    """Drop L1 entries for keys written or deleted through this process."""
+    for key in keys:
+        _local_cache.pop(key, None)
+
+
+# "l1" broadcast payload: deleted keys and patterns, one per line
+_L1_SEPARATOR = "\n"
+
+
+def _drop_local_message(payload: str) -> None:
+    """Drop L1 entries named by an "l1" broadcast from any worker."""
+    for item in payload.split(_L1_SEPARATOR):
+        if "*" in item:
+            for key in [key for key in _local_cache if fnmatchcase(key, item)]:
+                del _local_cache[key]
+        else:
+            _local_cache.pop(item, None)
+
+
+class InvalidationBuffer:
+    """
+    Defer cache deletes issued inside the block and flush them together on exit.
+    
+    Usage:
+        async with InvalidationBuffer(redis):
+            for user in admin_users:
+                await service.create_notification(...)
+    
+    delete, delete_many, delete_pattern and delete_keys_and_patterns only
+    record their keys/patterns while a buffer is active in the current task.
+    On exit, keys covered by a queued pattern and patterns covered by a wider
+    one are dropped, and the rest go out as one SCAN pass plus one UNLINK.
+    """
+    
+    def __init__(self, redis: Redis):
+        self.redis = redis
+        self.keys: set = set()
+        self.patterns: set = set()
+        self._token = None
+    
+    async def __aenter__(self) -> "InvalidationBuffer":
+        self._token = _invalidation_buffer.set(self)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        _invalidation_buffer.reset(self._token)
+        await self.flush()
+    
+    async def flush(self) -> int:
+        """
+        Delete everything recorded so far.
+        
+        Returns:
+            Number of keys deleted
+        """
+        patterns = [
+            pattern for pattern in self.patterns
+            if not any(
+                other != pattern and other.endswith("*") and pattern.startswith(other[:-1])
+                for other in self.patterns
+            )
+        ]
+        keys = [key for key in self.keys if not any(fnmatchcase(key, pattern) for pattern in patterns)]
+        self.keys.clear()
+        self.patterns.clear()
+        
+        if not keys and not patterns:
+            return 0
+        return await CacheService(self.redis).delete_keys_and_patterns(keys, patterns)
+
+
+_invalidation_buffer: ContextVar[Optional[InvalidationBuffer]] = ContextVar(
+    "cache_invalidation_buffer", default=None
+)
+
 
 class CacheService:
     """
@@ -16,24 +148,42 @@ class CacheService:
     def __init__(self, redis: Redis):
         self.redis = redis
     
-    async def get(self, key: str, as_json: bool = True) -> Optional[Any]:
+    async def get(self, key: str, as_json: bool = True, local: bool = False) -> Optional[Any]:
         """
         Get value from cache.
         
         Args:
             key: Cache key
             as_json: If True, deserialize as JSON, else return raw string
+            local: If True, serve from the in-process L1 copy for up to
+                CACHE_LOCAL_TTL before going to Redis; deletes from any worker
+                drop it early via the "l1" broadcast. Only for read-mostly
+                values that tolerate that staleness; the returned object is
+                shared and must not be mutated.
             
         Returns:
             Cached value or None if not found
         """
+        if local:
+            entry = _local_cache.get(key)
+            if entry is not None:
+                if entry[0] > time.monotonic():
+                    _local_cache.move_to_end(key)
+                    return entry[1]
+                del _local_cache[key]
+        
         try:
             value = await self.redis.get(key)
             if value is None:
                 return None
             
             if as_json:
-                return json.loads(value)
+                value = orjson.loads(value)
+            
+            if local:
+                _local_cache[key] = (time.monotonic() + settings.CACHE_LOCAL_TTL, value)
+                if len(_local_cache) > settings.CACHE_LOCAL_MAX_ENTRIES:
+                    _local_cache.popitem(last=False)
             return value
             
         except Exception as e:
@@ -54,25 +204,49 @@ class CacheService:
             key: Cache key
             value: Value to cache
             ttl: Time to live in seconds (default: CACHE_DEFAULT_TTL)
-            as_json: If True, serialize as JSON, else store as string
+            as_json: If True, serialize as JSON (bytes are stored as pre-encoded JSON), else store as string
             
         Returns:
             True if successful, False otherwise
         """
         try:
             if as_json:
-                serialized_value = json.dumps(value, ensure_ascii=False, default=str)
+                serialized_value = _dumps(value)
             else:
                 serialized_value = value
             
             cache_ttl = ttl or settings.CACHE_DEFAULT_TTL
-            await self.redis.setex(key, cache_ttl, serialized_value)
+            await self.redis.set(key, serialized_value, ex=cache_ttl)
+            _drop_local((key,))
             return True
             
         except Exception as e:
             logger.error(f"Cache set error for key {key}: {e}")
             return False
     
+    async def refresh_value(self, key: str, value: Any, as_json: bool = True) -> bool:
+        """
+        Replace the value of an existing key without resetting its TTL.
+        
+        Uses SET XX KEEPTTL, so in-place updates keep the original deadline
+        and an already-expired key is not recreated without a TTL.
+        
+        Args:
+            key: Cache key
+            value: New value
+            as_json: If True, serialize as JSON, else store as string
+            
+        Returns:
+            True if the key existed and was updated, False otherwise
+        """
+        try:
+            serialized_value = _dumps(value) if as_json else value
+            return bool(await self.redis.set(key, serialized_value, xx=True, keepttl=True))
+            
+        except Exception as e:
+            logger.error(f"Cache refresh error for key {key}: {e}")
+            return False
+    
     async def delete(self, key: str) -> bool:
         """
         Delete key from cache.
@@ -83,8 +257,15 @@ class CacheService:
         Returns:
             True if deleted, False otherwise
         """
+        buffer = _invalidation_buffer.get()
+        if buffer is not None:
+            _drop_local((key,))
+            buffer.keys.add(key)
+            return True
+        
+        _drop_local((key,))
         try:
-            await self.redis.delete(key)
+            await self._unlink_and_notify([key], [key])
             return True
         except Exception as e:
             logger.error(f"Cache delete error for key {key}: {e}")
@@ -100,23 +281,30 @@ class CacheService:
         Returns:
             Number of keys deleted
         """
+        buffer = _invalidation_buffer.get()
+        if buffer is not None:
+            buffer.patterns.add(pattern)
+            return 0
+        
         try:
+            scan_unlink = self.redis.register_script(SCAN_UNLINK_SCRIPT)
             cursor = 0
             deleted_count = 0
             
+            # Each round trip scans a page and unlinks its matches server-side
             while True:
-                cursor, keys = await self.redis.scan(
-                    cursor=cursor,
-                    match=pattern,
-                    count=100
-                )
-                
-                if keys:
-                    deleted_count += await self.redis.delete(*keys)
+                cursor, deleted = await scan_unlink(args=[cursor, pattern, settings.CACHE_SCAN_COUNT])
+                cursor = int(cursor)
+                deleted_count += deleted
                 
                 if cursor == 0:
                     break
             
+            await self.redis.publish(
+                CacheKeys.cache_invalidation_channel(),
+                f"l1:{pattern}"
+            )
+            
             logger.info(f"Deleted {deleted_count} keys matching pattern: {pattern}")
             return deleted_count
             
@@ -190,6 +378,27 @@ class CacheService:
             logger.error(f"Cache increment error for key {key}: {e}")
             return 0
     
+    async def rate_limit_hit(self, key: str, window_ms: int) -> int:
+        """
+        Count a hit in a fixed rate-limit window in one round trip.
+        
+        The script is sent by EVALSHA, with redis-py falling back to EVAL
+        (and caching it) on NOSCRIPT.
+        
+        Args:
+            key: Rate limit key (e.g. CacheKeys.rate_limit_ip(ip))
+            window_ms: Window length in milliseconds
+            
+        Returns:
+            Hits in the current window including this one, 0 on error
+        """
+        try:
+            rate_limit = self.redis.register_script(RATE_LIMIT_SCRIPT)
+            return int(await rate_limit(keys=[key], args=[window_ms]))
+        except Exception as e:
+            logger.error(f"Rate limit hit error for key {key}: {e}")
+            return 0
+    
     async def decr(self, key: str, amount: int = 1) -> int:
         """
         Decrement integer value.
@@ -223,17 +432,20 @@ class CacheService:
                 return {}
             
             values = await self.redis.mget(keys)
+            if not as_json:
+                return dict(zip(keys, values))
+            
+            loads = orjson.loads
             result = {}
             
             for key, value in zip(keys, values):
                 if value is None:
                     result[key] = None
-                elif as_json:
-                    try:
-                        result[key] = json.loads(value)
-                    except json.JSONDecodeError:
-                        result[key] = value
-                else:
+                    continue
+                # try is zero-cost on 3.11 when nothing raises; only non-JSON values pay
+                try:
+                    result[key] = loads(value)
+                except orjson.JSONDecodeError:
                     result[key] = value
             
             return result
@@ -263,24 +475,116 @@ class CacheService:
             if not mapping:
                 return True
             
-            pipe = self.redis.pipeline()
             cache_ttl = ttl or settings.CACHE_DEFAULT_TTL
             
-            for key, value in mapping.items():
-                if as_json:
-                    serialized_value = json.dumps(value, ensure_ascii=False, default=str)
-                else:
-                    serialized_value = value
-                
-                pipe.setex(key, cache_ttl, serialized_value)
-            
-            await pipe.execute()
+            # SETEX per key is already one round trip in a pipeline; skip MULTI/EXEC
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    pipe.setex(key, cache_ttl, _dumps(value) if as_json else value)
+                await pipe.execute()
             return True
             
         except Exception as e:
             logger.error(f"Cache set_many error: {e}")
             return False
     
+    async def delete_many(self, keys: List[str]) -> int:
+        """
+        Delete multiple keys in one round trip.
+        
+        Uses UNLINK so Redis frees values in a background thread, batched
+        into a single pipeline for large key lists.
+        
+        Args:
+            keys: List of cache keys
+            
+        Returns:
+            Number of keys deleted
+        """
+        try:
+            if not keys:
+                return 0
+            
+            _drop_local(keys)
+            buffer = _invalidation_buffer.get()
+            if buffer is not None:
+                buffer.keys.update(keys)
+                return 0
+            
+            return await self._unlink_and_notify(keys, keys)
+            
+        except Exception as e:
+            logger.error(f"Cache delete_many error: {e}")
+            return 0
+    
+    async def _unlink_and_notify(self, keys: List[str], notify: List[str]) -> int:
+        """
+        UNLINK keys and tell every worker to drop matching L1 entries, in one round trip.
+        
+        Args:
+            keys: Keys to unlink
+            notify: Keys/patterns to publish on the invalidation channel
+            
+        Returns:
+            Number of keys deleted
+        """
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for i in range(0, len(keys), UNLINK_BATCH_SIZE):
+                pipe.unlink(*keys[i:i + UNLINK_BATCH_SIZE])
+            if notify:
+                pipe.publish(CacheKeys.cache_invalidation_channel(), f"l1:{_L1_SEPARATOR.join(notify)}")
+            results = await pipe.execute()
+        
+        return sum(results[:-1]) if notify else sum(results)
+    
+    async def scan_keys(self, pattern: str) -> List[str]:
+        """
+        Collect all keys matching pattern with a non-blocking SCAN cursor.
+        
+        Args:
+            pattern: Key pattern (e.g., "user:*")
+            
+        Returns:
+            Matching keys
+        """
+        return [key async for key in self.redis.scan_iter(match=pattern, count=settings.CACHE_SCAN_COUNT)]
+    
+    async def delete_keys_and_patterns(self, keys: List[str], patterns: List[str]) -> int:
+        """
+        Delete explicit keys together with every key matching patterns.
+        
+        Pattern matches are collected first so everything is removed by one
+        delete_many call instead of a DEL per key group.
+        
+        Args:
+            keys: Cache keys to delete
+            patterns: Key patterns whose matches are deleted too
+            
+        Returns:
+            Number of keys deleted
+        """
+        buffer = _invalidation_buffer.get()
+        if buffer is not None:
+            _drop_local(keys)
+            buffer.keys.update(keys)
+            buffer.patterns.update(patterns)
+            return 0
+        
+        _drop_local(keys)
+        keys_to_delete = list(keys)
+        try:
+            for matches in await asyncio.gather(*(self.scan_keys(pattern) for pattern in patterns)):
+                keys_to_delete.extend(matches)
+        except Exception as e:
+            logger.error(f"Cache scan error for patterns {patterns}: {e}")
+        
+        try:
+            # Other workers get the explicit keys and the patterns, not every scanned match
+            return await self._unlink_and_notify(keys_to_delete, [*keys, *patterns])
+        except Exception as e:
+            logger.error(f"Cache delete_keys_and_patterns error: {e}")
+            return 0
+    
     async def flush_db(self) -> bool:
         """
         Flush entire database (use with caution!).
@@ -295,4 +599,6 @@ class CacheService:
         except Exception as e:
             logger.error(f"Cache flush error: {e}")
             return False
-        
\ No newline at end of file
+
+
+local_cache_listener.register("l1", _drop_local_message)
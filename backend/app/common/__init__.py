@@ -39,6 +39,9 @@ from app.common.constants import (
     EMAIL_REGEX,
     URL_REGEX,
     BOT_KEY_REGEX,
+    EMAIL_PATTERN,
+    URL_PATTERN,
+    BOT_KEY_PATTERN,
 )
 
 # Types (data classes)
@@ -79,6 +82,9 @@ __all__ = [
     "EMAIL_REGEX",
     "URL_REGEX",
     "BOT_KEY_REGEX",
+    "EMAIL_PATTERN",
+    "URL_PATTERN",
+    "BOT_KEY_PATTERN",
     
     # Types
     "CurrentUser",
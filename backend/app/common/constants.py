@@ -2,7 +2,8 @@
 Common constants and configurations used across the application.
 Note: Enums are in enums.py, not here. This file only contains static values.
 """
-from typing import Set
+import re
+from typing import FrozenSet
 
 
 # ============================================================================
@@ -10,25 +11,25 @@ from typing import Set
 # ============================================================================
 
 # Docling-supported formats (advanced processing with structure preservation)
-DOCLING_FORMATS: Set[str] = {
+DOCLING_FORMATS: FrozenSet[str] = frozenset({
     '.pdf', '.docx', '.pptx', '.xlsx', 
     '.html', '.htm', '.csv',
     '.png', '.jpeg', '.jpg', '.tiff', '.tif', '.bmp',
     '.md', '.txt'
-}
+})
 
 # LangChain-supported formats (basic text extraction)
-LANGCHAIN_FORMATS: Set[str] = {
+LANGCHAIN_FORMATS: FrozenSet[str] = frozenset({
     '.pdf', '.docx', '.doc', 
     '.txt', '.md', 
     '.html', '.htm', 
     '.pptx', '.ppt', 
     '.xlsx', '.xls', 
     '.csv'
-}
+})
 
 # All supported file extensions for document upload
-SUPPORTED_FILE_EXTENSIONS: Set[str] = DOCLING_FORMATS.union(LANGCHAIN_FORMATS)
+SUPPORTED_FILE_EXTENSIONS: FrozenSet[str] = DOCLING_FORMATS | LANGCHAIN_FORMATS
 
 # Max file size for uploads (in bytes)
 MAX_FILE_SIZE_MB = 50
@@ -138,6 +139,11 @@ EMAIL_REGEX = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
 URL_REGEX = r'^https?://[^\s<>"{}|\\^`\[\]]+$'
 BOT_KEY_REGEX = r'^bot_[a-zA-Z0-9_]+$'
 
+# Compiled once at import; use these for matching instead of re.match(<REGEX>, ...)
+EMAIL_PATTERN = re.compile(EMAIL_REGEX)
+URL_PATTERN = re.compile(URL_REGEX)
+BOT_KEY_PATTERN = re.compile(BOT_KEY_REGEX)
+
 
 # ============================================================================
 # Email Subjects
@@ -226,13 +232,13 @@ class FilePathPattern:
 # ============================================================================
 
 # Extensions to exclude when crawling URLs
-EXCLUDED_URL_EXTENSIONS: Set[str] = {
+EXCLUDED_URL_EXTENSIONS: FrozenSet[str] = frozenset({
     '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.ico', '.bmp',  # Images
     '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',  # Documents
     '.zip', '.rar', '.tar', '.gz',  # Archives
     '.mp4', '.avi', '.mov', '.mp3', '.wav',  # Media
     '.css', '.js', '.json', '.xml', '.woff', '.woff2', '.ttf', '.eot'  # Assets
-}
+})
 
 
 # ============================================================================
@@ -242,7 +248,7 @@ EXCLUDED_URL_EXTENSIONS: Set[str] = {
 class WidgetFile:
     """Widget file management constants"""
     # Allowed file extensions
-    ALLOWED_EXTENSIONS: Set[str] = {'.js'}
+    ALLOWED_EXTENSIONS: FrozenSet[str] = frozenset({'.js'})
     
     # File size limits
     MAX_FILE_SIZE_MB = 10
@@ -252,6 +258,8 @@ class WidgetFile:
     STORAGE_PREFIX = "widget"
     LATEST_FILENAME = "widget.js"
     VERSIONED_FILENAME_TEMPLATE = "widget.v{version}.js"
+    GZIP_SUFFIX = ".gz"  # Pre-compressed sibling stored next to each upload
+    GZIP_SPOOL_MAX_BYTES = 1024 * 1024  # Compressed sibling spills to disk past 1MB
     
     # Cache headers
     VERSIONED_CACHE_CONTROL = "public, max-age=31536000, immutable"  # 1 year
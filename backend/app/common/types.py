@@ -1,11 +1,18 @@
 from typing import Optional
 from app.common.enums import UserRole
 
+# Resolved once; role checks run on every authenticated request
+_ROOT = UserRole.ROOT.value
+_ADMIN = UserRole.ADMIN.value
+_MEMBER = UserRole.MEMBER.value
+
 
 class CurrentUser:
     """
     Current authenticated user data.
     """
+    __slots__ = ("user_id", "email", "role", "full_name")
+    
     def __init__(
         self,
         user_id: str,
@@ -20,15 +27,15 @@ class CurrentUser:
     
     def is_root(self) -> bool:
         """Check if user has root role."""
-        return self.role == UserRole.ROOT.value
+        return self.role == _ROOT
     
     def is_admin(self) -> bool:
         """Check if user has admin role."""
-        return self.role == UserRole.ADMIN.value
+        return self.role == _ADMIN
     
     def is_member(self) -> bool:
         """Check if user has member role."""
-        return self.role == UserRole.MEMBER.value
+        return self.role == _MEMBER
     
     def has_role(self, *roles: str) -> bool:
         """Check if user has any of the specified roles."""
@@ -1,3 +1,4 @@
+from functools import cached_property
 from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from app.common.enums import Environment, AuthType
@@ -27,6 +28,7 @@ class Settings(BaseSettings):
     DB_MAX_OVERFLOW: int = 40
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_RECYCLE: int = 3600
+    DB_STATEMENT_CACHE_SIZE: int = 1024
     
     # Redis Configuration
     REDIS_HOST: str = "redis"
@@ -37,6 +39,7 @@ class Settings(BaseSettings):
     REDIS_SOCKET_TIMEOUT: int = 5
     REDIS_SOCKET_CONNECT_TIMEOUT: int = 5
     REDIS_URL: Optional[str] = "redis://redis:6379/0"
+    REDIS_PUBSUB_POOL_SIZE: int = 10
     
     # Cache TTL Configuration (seconds)
     CACHE_DEFAULT_TTL: int = 3600  # 1 hour
@@ -46,11 +49,21 @@ class Settings(BaseSettings):
     CACHE_VISITOR_TTL: int = 1800
     CACHE_PROVIDER_TTL: int = 7200  # 2 hours
     CACHE_MODEL_TTL: int = 7200
+    CACHE_ACTIVE_PROVIDERS_TTL: int = 300
     CACHE_BOT_CONFIG_TTL: int = 3600
     CACHE_ALLOWED_ORIGINS_TTL: int = 3600
     CACHE_ANALYTICS_OVERVIEW_TTL: int = 300  # 5 minutes
     CACHE_ANALYTICS_BOT_TTL: int = 300
+    CACHE_STATS_SUMMARY_TTL: int = 30
+    CACHE_WIDGET_CONFIG_TTL: int = 300
+    CACHE_WIDGET_MISSING_TTL: int = 60
+    CACHE_WIDGET_FILES_TTL: int = 30
+    WIDGET_JS_CACHE_TTL: int = 300
+    CACHE_LOCAL_TTL: int = 5  # In-process L1 copy for reads that opt in via CacheService.get(local=True)
+    CACHE_LOCAL_MAX_ENTRIES: int = 1024
+    WIDGET_JS_REDIRECT: bool = False  # Opt-in: 302 to the public bucket, bypassing 404/ETag/gzip handling
     CACHE_LIST_TTL: int = 600  # 10 minutes
+    CACHE_SCAN_COUNT: int = 1000  # SCAN COUNT hint for pattern invalidation
     CACHE_BLACKLIST_TTL: int = 86400  # 24 hours
     CACHE_RATE_LIMIT_TTL: int = 60  # 1 minute
     
@@ -100,6 +113,9 @@ class Settings(BaseSettings):
     
     # Webhook Secret
     BACKEND_WEBHOOK_SECRET: str = "change-this-webhook-secret"
+    WEBHOOK_MAX_BODY_BYTES: int = 4 * 1024 * 1024
+    WEBHOOK_DELIVERY_TTL: int = 3600
+    WEBHOOK_PROCESSING_TTL: int = 60  # In-progress marker; expires if the handling worker dies
     
     # Progress State Cache
     PROGRESS_STATE_TTL: int = 600
@@ -148,7 +164,7 @@ class Settings(BaseSettings):
     # =========================================================================
     # DEFAULT PROVIDERS CONFIGURATION
     # =========================================================================
-    DEFAULT_PROVIDERS: list[dict] = [
+    DEFAULT_PROVIDERS: tuple[dict, ...] = (
         {
             "name": "OpenAI",
             "slug": "openai",
@@ -215,7 +231,7 @@ class Settings(BaseSettings):
                 }
             ]
         }
-    ]
+    )
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -230,6 +246,14 @@ class Settings(BaseSettings):
         
         if "DEBUG" not in kwargs:
             self.DEBUG = self.ENV == "dev"
+    
+    @cached_property
+    def redis_url(self) -> str:
+        """REDIS_URL, or a URL assembled from REDIS_HOST/PORT/DB/PASSWORD when unset."""
+        if self.REDIS_URL:
+            return self.REDIS_URL
+        auth_part = f":{self.REDIS_PASSWORD}@" if self.REDIS_PASSWORD else ""
+        return f"redis://{auth_part}{self.REDIS_HOST}:{self.REDIS_PORT}/{self.REDIS_DB}"
 
 
 settings = Settings()
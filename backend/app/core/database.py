@@ -1,5 +1,7 @@
+import logging
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Optional
+from typing import AsyncGenerator, Awaitable, Callable, Optional
+from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     AsyncEngine,
@@ -13,6 +15,9 @@ from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Session.info key holding callbacks that transaction() runs after a successful commit
+_AFTER_COMMIT_CALLBACKS = "after_commit_callbacks"
+
 
 class DatabaseManager:
     """
@@ -36,6 +41,9 @@ class DatabaseManager:
                 pool_timeout=settings.DB_POOL_TIMEOUT,
                 pool_recycle=settings.DB_POOL_RECYCLE,
                 pool_pre_ping=True,
+                connect_args={
+                    "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+                },
             )
             
             self.session_factory = async_sessionmaker(
@@ -118,13 +126,8 @@ class RedisManager:
         Initialize Redis connection pool.
         """
         try:
-            redis_url = settings.REDIS_URL
-            if not redis_url:
-                auth_part = f":{settings.REDIS_PASSWORD}@" if settings.REDIS_PASSWORD else ""
-                redis_url = f"redis://{auth_part}{settings.REDIS_HOST}:{settings.REDIS_PORT}/{settings.REDIS_DB}"
-            
             self.pool = ConnectionPool.from_url(
-                redis_url,
+                settings.redis_url,
                 max_connections=settings.REDIS_MAX_CONNECTIONS,
                 socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
                 socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
@@ -186,6 +189,56 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+@asynccontextmanager
+async def transaction(db: AsyncSession, logger: logging.Logger, action: str) -> AsyncGenerator[None, None]:
+    """
+    Commit the request session on success, roll back on any error.
+    Unexpected errors are logged and raised as HTTP 500.
+    
+    Usage:
+        async with transaction(db, logger, "update provider"):
+            provider = await provider_service.update_provider(...)
+    
+    Args:
+        db: Request database session
+        logger: Caller's logger
+        action: Action name used in the error log and response detail
+    """
+    try:
+        yield
+        await db.commit()
+    except HTTPException:
+        db.info.pop(_AFTER_COMMIT_CALLBACKS, None)
+        await db.rollback()
+        raise
+    except Exception as e:
+        db.info.pop(_AFTER_COMMIT_CALLBACKS, None)
+        await db.rollback()
+        logger.error(f"Failed to {action}: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to {action}: {str(e)}"
+        )
+    
+    for callback in db.info.pop(_AFTER_COMMIT_CALLBACKS, ()):
+        await callback()
+
+
+def after_commit(db: AsyncSession, callback: Callable[[], Awaitable[None]]) -> None:
+    """
+    Run callback once the surrounding transaction() has committed.
+    
+    Cache keys deleted here go only once the new rows are visible, so a
+    concurrent reader cannot re-cache the old rows after the delete.
+    Callbacks are dropped if the transaction rolls back.
+    
+    Args:
+        db: Request database session
+        callback: Zero-argument coroutine function to await after commit
+    """
+    db.info.setdefault(_AFTER_COMMIT_CALLBACKS, []).append(callback)
+
+
 def get_redis() -> Redis:
     """
     Dependency for getting Redis client.
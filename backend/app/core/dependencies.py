@@ -1,3 +1,4 @@
+import asyncio
 from typing import Optional
 from uuid import UUID
 from fastapi import Depends, HTTPException, status
@@ -10,6 +11,11 @@ from app.core.database import get_db, get_redis
 from app.core.security import decode_token, verify_token_type
 from app.common.types import CurrentUser
 from app.common.enums import UserRole
+from app.models.user import User
+from app.services.document import DocumentService
+from app.services.notification import NotificationService
+from app.services.provider import ProviderService
+from app.services.worker import WorkerService
 from app.utils.logging import get_logger
 from app.cache.keys import CacheKeys
 
@@ -45,15 +51,6 @@ async def get_current_user(
     verify_token_type(payload, "access")
     
     jti = payload.get("jti")
-    if jti:
-        is_blacklisted = await redis.exists(CacheKeys.blacklist(jti))
-        if is_blacklisted:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token has been revoked",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-    
     user_id = payload.get("sub")
     email = payload.get("email")
     role = payload.get("role")
@@ -66,11 +63,31 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    from app.models.user import User
-    
-    result = await db.execute(
+    user_query = db.execute(
         select(User.is_active).where(User.id == UUID(user_id))
     )
+    
+    if jti:
+        # Blacklist check and user lookup are independent, so overlap the Redis and DB round trips.
+        # Both are awaited to completion before raising so the session is never left mid-query.
+        is_blacklisted, result = await asyncio.gather(
+            redis.exists(CacheKeys.blacklist(jti)),
+            user_query,
+            return_exceptions=True
+        )
+        for outcome in (is_blacklisted, result):
+            if isinstance(outcome, BaseException):
+                raise outcome
+        
+        if is_blacklisted:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+    else:
+        result = await user_query
+    
     is_active = result.scalar_one_or_none()
     
     if is_active is None:
@@ -130,10 +147,12 @@ def _require_role(*allowed_roles: str):
     Returns:
         Dependency function that checks user role
     """
+    allowed = frozenset(allowed_roles)
+    
     async def role_checker(
         current_user: CurrentUser = Depends(get_current_user)
     ) -> CurrentUser:
-        if not current_user.has_role(*allowed_roles):
+        if current_user.role not in allowed:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Insufficient permissions. Required roles: {', '.join(allowed_roles)}"
@@ -149,6 +168,43 @@ Admin = _require_role(UserRole.ROOT.value, UserRole.ADMIN.value)
 Member = _require_role(UserRole.ROOT.value, UserRole.ADMIN.value, UserRole.MEMBER.value)
 
 
+def get_provider_service(
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis)
+) -> ProviderService:
+    """
+    Build ProviderService from the request-scoped DB session and Redis client.
+    
+    FastAPI caches get_db per request, so endpoints that also depend on
+    get_db for commit/rollback share the same session as the service.
+    """
+    return ProviderService(db, redis)
+
+
+def get_document_service(
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis)
+) -> DocumentService:
+    """Build DocumentService from the request-scoped DB session and Redis client."""
+    return DocumentService(db, redis)
+
+
+def get_notification_service(
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis)
+) -> NotificationService:
+    """Build NotificationService from the request-scoped DB session and Redis client."""
+    return NotificationService(db, redis)
+
+
+def get_worker_service(
+    db: AsyncSession = Depends(get_db),
+    redis: Redis = Depends(get_redis)
+) -> WorkerService:
+    """Build WorkerService from the request-scoped DB session and Redis client."""
+    return WorkerService(db, redis)
+
+
 async def get_widget_session(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     redis: Redis = Depends(get_redis)
@@ -220,7 +276,6 @@ async def verify_admin_token(token: str, db: AsyncSession) -> None:
         
         user_id = payload.get("sub")
         
-        from app.models.user import User
         stmt = select(User).where(User.id == user_id)
         result = await db.execute(stmt)
         user = result.scalar_one_or_none()
@@ -6,16 +6,21 @@ from typing import Callable
 import time
 import uuid
 import fnmatch
+import re
 from sqlalchemy import select
 
 from app.config.settings import settings
 from app.utils.logging import get_logger
+from app.utils.security import new_webhook_hmac, webhook_signature_matches
 from app.utils.request_utils import get_request_origin
 from app.common.enums import Environment
 from app.cache.keys import CacheKeys
+from app.cache.service import CacheService
 
 logger = get_logger(__name__)
 
+_WIDGET_CONFIG_BOT_ID = re.compile(r'/widget/config/([a-f0-9-]{36})')
+
 
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """
@@ -97,9 +102,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             try:
                 rate_key = CacheKeys.rate_limit_ip(client_ip)
                 
-                current = await redis.get(rate_key)
+                hits = await CacheService(redis).rate_limit_hit(rate_key, 60_000)
                 
-                if current and int(current) >= settings.RATE_LIMIT_IP_PER_MINUTE:
+                if hits > settings.RATE_LIMIT_IP_PER_MINUTE:
                     logger.warning(f"Rate limit exceeded for IP: {client_ip}")
                     return JSONResponse(
                         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -110,11 +115,6 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                         headers={"Retry-After": "60"}
                     )
                 
-                pipe = redis.pipeline()
-                pipe.incr(rate_key)
-                pipe.expire(rate_key, 60)  
-                await pipe.execute()
-                
             except Exception as e:
                 logger.error(f"Rate limit check failed: {str(e)}")
         
@@ -205,8 +205,7 @@ class WidgetCORSMiddleware(BaseHTTPMiddleware):
             bot_key = request.query_params.get("bot_key") or request.path_params.get("bot_key")
             bot_id = None
             
-            import re
-            bot_id_match = re.search(r'/widget/config/([a-f0-9-]{36})', path)
+            bot_id_match = _WIDGET_CONFIG_BOT_ID.search(path)
             if bot_id_match:
                 bot_id = bot_id_match.group(1)
             
@@ -394,6 +393,92 @@ class WidgetCORSMiddleware(BaseHTTPMiddleware):
         return False
 
 
+class WebhookSignatureMiddleware(BaseHTTPMiddleware):
+    """
+    HMAC-SHA256 verification for internal webhook endpoints.
+    Rejects unsigned/invalid requests before routing and dependency injection.
+    """
+    
+    WEBHOOK_PATHS = (
+        f"{settings.API_V1_PREFIX}/webhooks/",
+        f"{settings.API_V1_PREFIX}/sitemap-crawl-update",
+    )
+    
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        """
+        Verify X-Webhook-Signature against the streamed request body.
+        
+        Args:
+            request: Incoming HTTP request
+            call_next: Next middleware or route handler
+            
+        Returns:
+            HTTP response, 401 if the signature is missing or invalid,
+            or 413 if the body exceeds WEBHOOK_MAX_BODY_BYTES
+        """
+        if request.method != "POST" or not request.url.path.startswith(self.WEBHOOK_PATHS):
+            return await call_next(request)
+        
+        client_ip = request.client.host if request.client else "unknown"
+        
+        signature = request.headers.get("X-Webhook-Signature")
+        if not signature:
+            logger.warning(
+                "Webhook received without signature",
+                extra={"path": request.url.path, "client_ip": client_ip}
+            )
+            return JSONResponse(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                content={"detail": "Missing webhook signature"}
+            )
+        
+        max_bytes = settings.WEBHOOK_MAX_BODY_BYTES
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+            return self._payload_too_large(request.url.path, client_ip)
+        
+        mac = new_webhook_hmac()
+        chunks = []
+        total = 0
+        async for chunk in request.stream():
+            # Content-Length may be absent (chunked) or wrong, so also count while streaming
+            total += len(chunk)
+            if total > max_bytes:
+                return self._payload_too_large(request.url.path, client_ip)
+            if mac is not None:
+                mac.update(chunk)
+            chunks.append(chunk)
+        
+        # Same caching Request.body() does, so the handler re-reads the body
+        request._body = b"".join(chunks)
+        
+        if mac is None:
+            logger.warning("BACKEND_WEBHOOK_SECRET is not set. Skipping signature verification.")
+        elif not webhook_signature_matches(mac, signature):
+            logger.warning(
+                "Invalid webhook signature",
+                extra={"path": request.url.path, "client_ip": client_ip}
+            )
+            return JSONResponse(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                content={"detail": "Invalid webhook signature"}
+            )
+        
+        return await call_next(request)
+    
+    @staticmethod
+    def _payload_too_large(path: str, client_ip: str) -> JSONResponse:
+        """Reject a webhook body larger than WEBHOOK_MAX_BODY_BYTES."""
+        logger.warning(
+            "Webhook body exceeds size limit",
+            extra={"path": path, "client_ip": client_ip}
+        )
+        return JSONResponse(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            content={"detail": "Webhook payload too large"}
+        )
+
+
 class ErrorHandlingMiddleware(BaseHTTPMiddleware):
     """
     Global error handling middleware.
@@ -457,4 +542,5 @@ def setup_middlewares(app) -> None:
     app.add_middleware(ErrorHandlingMiddleware)
     app.add_middleware(RateLimitMiddleware)
     app.add_middleware(WidgetCORSMiddleware)
+    app.add_middleware(WebhookSignatureMiddleware)
     app.add_middleware(RequestLoggingMiddleware)
@@ -0,0 +1,98 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Optional
+from redis.asyncio import Redis
+from redis.asyncio.client import PubSub
+
+from app.config.settings import settings
+from app.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class PubSubPool:
+    """
+    Pool of idle Redis PubSub objects for SSE endpoints.
+
+    Closing a PubSub releases (and disconnects) its dedicated connection, so
+    every SSE reconnect would otherwise pay a fresh TCP handshake. Leased
+    objects are unsubscribed on release and kept open for the next stream.
+    """
+
+    def __init__(self, max_idle: int = settings.REDIS_PUBSUB_POOL_SIZE):
+        self.max_idle = max_idle
+        self._idle: Optional[asyncio.Queue] = None
+
+    def _queue(self) -> asyncio.Queue:
+        if self._idle is None:
+            self._idle = asyncio.Queue(maxsize=self.max_idle)
+        return self._idle
+
+    @asynccontextmanager
+    async def lease(self, redis: Redis, channel: str) -> AsyncGenerator[PubSub, None]:
+        """
+        Lease a PubSub subscribed to channel.
+
+        Usage:
+            async with pubsub_pool.lease(redis, channel) as pubsub:
+                message = await pubsub.get_message(...)
+
+        Args:
+            redis: Redis client used to create new PubSub objects
+            channel: Channel to subscribe to for the lease duration
+
+        Yields:
+            PubSub: Subscribed PubSub object
+        """
+        try:
+            pubsub = self._queue().get_nowait()
+        except asyncio.QueueEmpty:
+            pubsub = redis.pubsub()
+
+        await pubsub.subscribe(channel)
+        try:
+            yield pubsub
+        finally:
+            await self._release(pubsub)
+
+    async def _release(self, pubsub: PubSub) -> None:
+        """Unsubscribe and return PubSub to the pool, closing it if unusable or pool is full."""
+        try:
+            await pubsub.unsubscribe()
+            # Consume pending confirmations (and late messages) so the next
+            # lease starts from a clean connection
+            while pubsub.subscribed:
+                message = await pubsub.get_message(timeout=1.0)
+                if message is None:
+                    raise TimeoutError("Timed out waiting for unsubscribe confirmation")
+
+            self._queue().put_nowait(pubsub)
+            return
+        except asyncio.QueueFull:
+            pass
+        except Exception as e:
+            logger.warning(f"Discarding pubsub connection: {e}")
+
+        try:
+            await pubsub.close()
+        except Exception as e:
+            logger.error(f"Failed to close pubsub connection: {e}")
+
+    async def close(self) -> None:
+        """
+        Close all idle PubSub objects.
+        """
+        if self._idle is None:
+            return
+
+        while not self._idle.empty():
+            pubsub = self._idle.get_nowait()
+            try:
+                await pubsub.close()
+            except Exception as e:
+                logger.error(f"Failed to close pubsub connection: {e}")
+
+        logger.info("PubSub pool closed")
+
+
+pubsub_pool = PubSubPool()
@@ -3,7 +3,7 @@ Pydantic schemas for Document.
 """
 from typing import Optional
 from datetime import datetime
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
 from uuid import UUID
 
 from app.common.enums import DocumentStatus, JobStatus
@@ -55,14 +55,15 @@ class DocumentResponse(DocumentBase):
 
     model_config = ConfigDict(from_attributes=True, populate_by_name=True)
 
-    @classmethod
-    def from_orm_with_computed(cls, document):
-        """Create response with computed fields from extra_data"""
+    @staticmethod
+    def _computed_data(document) -> dict:
+        """Build response data with computed fields from extra_data"""
         uploaded_by = None
         if document.user:
             uploaded_by = document.user.full_name or document.user.email
         
-        data = {
+        extra_data = document.extra_data or {}
+        return {
             "id": document.id,
             "bot_id": document.bot_id,
             "user_id": document.user_id,
@@ -73,18 +74,32 @@ class DocumentResponse(DocumentBase):
             "content_hash": document.content_hash,
             "status": document.status,
             "raw_content": document.raw_content,
-            "extra_data": document.extra_data or {},
+            "extra_data": extra_data,
             "error_message": document.error_message,
             "processed_at": document.processed_at,
             "created_at": document.created_at,
             "updated_at": document.updated_at,
-            "task_id": (document.extra_data or {}).get("task_id"),
+            "task_id": extra_data.get("task_id"),
             "source_type": "crawl" if document.url else "file",
-            "chunk_count": (document.extra_data or {}).get("chunks_count", 0),
-            "file_size": (document.extra_data or {}).get("file_size"),
+            "chunk_count": extra_data.get("chunks_count", 0),
+            "file_size": extra_data.get("file_size"),
             "web_url": document.url,
         }
-        return cls(**data)
+
+    @classmethod
+    def from_orm_with_computed(cls, document):
+        """Create response with computed fields from extra_data"""
+        return cls.model_validate(cls._computed_data(document))
+
+    @classmethod
+    def from_orm_list(cls, documents) -> list["DocumentResponse"]:
+        """Create responses for many documents in a single validation pass"""
+        return _DOCUMENT_LIST_ADAPTER.validate_python(
+            [cls._computed_data(document) for document in documents]
+        )
+
+
+_DOCUMENT_LIST_ADAPTER = TypeAdapter(list[DocumentResponse])
 
 
 class DocumentListResponse(BaseModel):
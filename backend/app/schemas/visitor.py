@@ -6,6 +6,9 @@ import re
 
 from app.models.visitor import SessionStatus
 
+_PHONE_SEPARATORS = re.compile(r'[\s\-\(\)\.]+')
+_PHONE_PATTERN = re.compile(r'^\+?\d{8,15}$')
+
 
 class VisitorInfoUpdate(BaseModel):
     """Schema for updating visitor information with validation."""
@@ -21,9 +24,9 @@ class VisitorInfoUpdate(BaseModel):
         if v is None:
             return v
         
-        phone_clean = re.sub(r'[\s\-\(\)\.]+', '', v)
+        phone_clean = _PHONE_SEPARATORS.sub('', v)
         
-        if not re.match(r'^\+?\d{8,15}$', phone_clean):
+        if not _PHONE_PATTERN.match(phone_clean):
             raise ValueError('Invalid phone number format. Must be 8-15 digits.')
         
         return v 
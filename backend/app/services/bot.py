@@ -1,6 +1,6 @@
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, Row
 from sqlalchemy.orm import selectinload
 from redis.asyncio import Redis
 from fastapi import HTTPException, status
@@ -106,6 +106,25 @@ class BotService:
         
         return bot
     
+    async def get_widget_fields(self, bot_id: str) -> Optional[Row]:
+        """
+        Get only the columns the public widget config needs.
+        
+        Skips the relationship loads and full row hydration of get_by_id.
+        
+        Args:
+            bot_id: Bot UUID
+            
+        Returns:
+            Row with id, name, bot_key, language, display_config, or None
+        """
+        result = await self.db.execute(
+            select(Bot.id, Bot.name, Bot.bot_key, Bot.language, Bot.display_config)
+            .where(Bot.id == bot_id)
+            .where(Bot.is_deleted.is_(False))
+        )
+        return result.first()
+    
     async def get_by_bot_key(self, bot_key: str) -> Optional[Bot]:
         """
         Get bot by bot_key.
@@ -7,11 +7,14 @@ import os
 import asyncio
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update, values, column, case, literal, Boolean, Integer, Text
+from sqlalchemy.dialects.postgresql import UUID
 from redis.asyncio import Redis
 from fastapi import HTTPException, status, UploadFile
 
+from app.models.bot import Bot
 from app.models.document import Document
+from app.schemas.webhook import FileProcessingResult
 from app.common.enums import DocumentStatus, DocumentSource
 from app.cache.service import CacheService
 from app.cache.keys import CacheKeys
@@ -213,7 +216,6 @@ class DocumentService:
                 detail="This file has already been uploaded for this bot"
             )
         
-        from app.models.bot import Bot
         result = await self.db.execute(
             select(Bot).where(Bot.id == bot_id).where(Bot.is_deleted.is_(False))
         )
@@ -299,71 +301,93 @@ class DocumentService:
             document.extra_data.update(extra_data)
         
         if status == DocumentStatus.COMPLETED:
-            from app.utils.datetime_utils import now
             document.processed_at = now()
         
         await self.db.flush()
         await self.db.refresh(document)
         
-        await self.cache_invalidation.invalidate_document(str(document.id), str(document.bot_id))
+        await self.cache_invalidation.invalidate_document(str(document.id))
         
         logger.info(f"Updated document {document.id} status to {status}")
         
         return document
     
-    async def update_processing_result(
-        self,
-        document_id: str,
-        success: bool,
-        chunks_count: Optional[int] = None,
-        error_message: Optional[str] = None
-    ) -> Document:
+    async def update_processing_results(self, results: List[FileProcessingResult]) -> set[uuid.UUID]:
         """
-        Update document with processing results from file-server.
+        Apply file-server processing results to their documents in one UPDATE.
         
         Called by webhook handler when file-server completes processing.
+        Replaces a lookup + update round trip per document with a single
+        UPDATE ... FROM (VALUES ...) RETURNING statement.
         
         Args:
-            document_id: Document UUID
-            success: Whether processing succeeded
-            chunks_count: Number of chunks created
-            error_message: Error message if failed
+            results: Processing results carrying a document_id
             
         Returns:
-            Updated document
+            UUIDs of the documents that were updated; any other ID was not found
         """
-        document = await self.get_by_id(document_id)
-        if not document:
-            logger.error(f"Document not found: {document_id}")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Document {document_id} not found"
+        rows = []
+        for result in results:
+            try:
+                document_id = uuid.UUID(result.document_id)
+            except (TypeError, ValueError):
+                continue
+            rows.append((document_id, result.success, result.chunks_count, result.error))
+        
+        if not rows:
+            return set()
+        
+        processed = values(
+            column("id", UUID(as_uuid=True)),
+            column("success", Boolean),
+            column("chunks_count", Integer),
+            column("error_message", Text),
+            name="processed"
+        ).data(rows)
+        
+        status_type = Document.status.type
+        timestamp = now()
+        
+        stmt = (
+            update(Document)
+            .where(Document.id == processed.c.id)
+            .values(
+                status=case(
+                    (processed.c.success, literal(DocumentStatus.COMPLETED, status_type)),
+                    else_=literal(DocumentStatus.FAILED, status_type)
+                ),
+                # Only a non-empty error replaces the stored one
+                error_message=func.coalesce(
+                    func.nullif(processed.c.error_message, ""),
+                    Document.error_message
+                ),
+                extra_data=case(
+                    (processed.c.chunks_count.is_(None), Document.extra_data),
+                    else_=Document.extra_data.op("||")(
+                        func.jsonb_build_object("chunks_count", processed.c.chunks_count)
+                    )
+                ),
+                processed_at=case(
+                    (processed.c.success, timestamp),
+                    else_=Document.processed_at
+                ),
+                # Bulk UPDATE skips TimestampMixin's onupdate hook
+                updated_at=timestamp
             )
+            .returning(Document.id)
+            .execution_options(synchronize_session=False)
+        )
         
-        new_status = DocumentStatus.COMPLETED if success else DocumentStatus.FAILED
+        updated = (await self.db.execute(stmt)).scalars().all()
         
-        extra_data = document.extra_data or {}
-        if chunks_count is not None:
-            extra_data["chunks_count"] = chunks_count
-        
-        await self.update_status(
-            document=document,
-            status=new_status,
-            error_message=error_message,
-            extra_data=extra_data
-        )
+        await self.cache_invalidation.invalidate_documents([str(doc_id) for doc_id in updated])
         
         logger.info(
-            f"Updated document {document_id} processing result: "
-            f"success={success}, chunks={chunks_count}",
-            extra={
-                "document_id": document_id,
-                "success": success,
-                "chunks_count": chunks_count
-            }
+            f"Updated processing results for {len(updated)}/{len(results)} documents",
+            extra={"updated": len(updated), "received": len(results)}
         )
         
-        return document
+        return set(updated)
     
     async def create_crawled_document(
         self,
@@ -545,7 +569,6 @@ class DocumentService:
         bot_id = str(document.bot_id)
         file_path = document.file_path
 
-        from app.models.bot import Bot
         if document.status == DocumentStatus.COMPLETED:
             try:
                 result = await self.db.execute(
@@ -586,7 +609,7 @@ class DocumentService:
         await self.db.delete(document)
         await self.db.flush()
         
-        await self.cache_invalidation.invalidate_document(doc_id, bot_id)
+        await self.cache_invalidation.invalidate_document(doc_id)
         
         logger.info(f"Deleted document: {doc_id}")
 
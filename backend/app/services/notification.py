@@ -10,7 +10,7 @@ Handles:
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, desc
+from sqlalchemy import select, and_, desc, func
 from sqlalchemy.orm import selectinload
 from sqlalchemy.orm.attributes import flag_modified
 from redis.asyncio import Redis
@@ -22,7 +22,7 @@ from app.common.enums import NotificationType, UserRole
 from app.schemas.webhook import VisitorGradingWebhook
 from app.schemas.notification import NotificationResponse
 from app.cache.invalidation import CacheInvalidation
-from app.cache.service import CacheService
+from app.cache.service import CacheService, InvalidationBuffer
 from app.cache.keys import CacheKeys
 from app.utils.email_queue import queue_email
 from app.utils.logging import get_logger
@@ -324,7 +324,7 @@ class NotificationService:
         if cached:
             return int(cached)
 
-        query = select(Notification).where(
+        query = select(func.count(Notification.id)).where(
             and_(
                 Notification.user_id == UUID(user_id),
                 Notification.is_read == False
@@ -332,7 +332,7 @@ class NotificationService:
         )
 
         result = await self.db.execute(query)
-        count = len(result.scalars().all())
+        count = result.scalar_one()
 
         await self.cache.set(cache_key, count, ttl=300, as_json=False)
 
@@ -522,52 +522,54 @@ class NotificationService:
             bot_name = bot.name
             visitor_link = f"/dashboard/visitors/{visitor_id}"
 
-            for user in admin_users:
-                await self.create_notification(
-                    user_id=str(user.id),
-                    title=f"Hot Lead Detected - Score: {score}/100",
-                    message=f"A hot lead was detected on bot '{bot_name}' with a score of {score}/100. Category: {insights.lead_category.upper()}",
-                    notification_type=NotificationType.LEAD_SCORED,
-                    link=visitor_link,
-                    extra_data={
-                        "bot_id": bot_id,
-                        "visitor_id": visitor_id,
+            # One UNLINK for every admin's notification keys instead of one per admin
+            async with InvalidationBuffer(self.redis):
+                for user in admin_users:
+                    await self.create_notification(
+                        user_id=str(user.id),
+                        title=f"Hot Lead Detected - Score: {score}/100",
+                        message=f"A hot lead was detected on bot '{bot_name}' with a score of {score}/100. Category: {insights.lead_category.upper()}",
+                        notification_type=NotificationType.LEAD_SCORED,
+                        link=visitor_link,
+                        extra_data={
+                            "bot_id": bot_id,
+                            "visitor_id": visitor_id,
+                            "score": score,
+                            "category": insights.lead_category,
+                            "engagement_level": insights.engagement_level
+                        }
+                    )
+
+                    email_data = {
+                        "owner_name": user.full_name or "User",
+                        "bot_name": bot_name,
                         "score": score,
-                        "category": insights.lead_category,
-                        "engagement_level": insights.engagement_level
+                        "category": insights.lead_category.upper(),
+                        "intent_signals": insights.intent_signals,
+                        "key_interests": insights.key_interests,
+                        "recommended_actions": insights.recommended_actions,
+                        "reasoning": insights.reasoning,
+                        "engagement_level": insights.engagement_level.upper(),
+                        "conversation_count": insights.conversation_count,
+                        "visitor_profile_url": f"{settings.FRONTEND_URL}/dashboard/visitors/{visitor_id}",
+                        "graded_at": now().strftime("%Y-%m-%d %H:%M"),
+                        "app_name": settings.APP_NAME,
                     }
-                )
-
-                email_data = {
-                    "owner_name": user.full_name or "User",
-                    "bot_name": bot_name,
-                    "score": score,
-                    "category": insights.lead_category.upper(),
-                    "intent_signals": insights.intent_signals,
-                    "key_interests": insights.key_interests,
-                    "recommended_actions": insights.recommended_actions,
-                    "reasoning": insights.reasoning,
-                    "engagement_level": insights.engagement_level.upper(),
-                    "conversation_count": insights.conversation_count,
-                    "visitor_profile_url": f"{settings.FRONTEND_URL}/dashboard/visitors/{visitor_id}",
-                    "graded_at": now().strftime("%Y-%m-%d %H:%M"),
-                    "app_name": settings.APP_NAME,
-                }
 
-                try:
-                    await queue_email(
-                        template_name="visitor-grader-notification.html",
-                        recipient_email=user.email,
-                        subject=f"Hot Lead Detected - Score: {score}/100 | {bot_name}",
-                        context=email_data,
-                        priority=9
-                    )
-                except Exception as email_error:
-                    logger.error(
-                        f"Failed to queue hot lead email: {email_error}",
-                        extra={"admin_id": str(user.id)},
-                        exc_info=True
-                    )
+                    try:
+                        await queue_email(
+                            template_name="visitor-grader-notification.html",
+                            recipient_email=user.email,
+                            subject=f"Hot Lead Detected - Score: {score}/100 | {bot_name}",
+                            context=email_data,
+                            priority=9
+                        )
+                    except Exception as email_error:
+                        logger.error(
+                            f"Failed to queue hot lead email: {email_error}",
+                            extra={"admin_id": str(user.id)},
+                            exc_info=True
+                        )
 
             logger.info(
                 "Hot lead notifications sent",
@@ -6,7 +6,7 @@ Providers are initialized from settings and cannot be created via API.
 """
 from typing import Optional, List, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, update, and_, or_
 from sqlalchemy.orm import selectinload
 from redis.asyncio import Redis
 from fastapi import HTTPException, status
@@ -16,7 +16,10 @@ from app.models.provider import Provider, Model, ProviderStatus, ModelType
 from app.models.bot import ProviderConfig
 from app.cache.service import CacheService
 from app.cache.keys import CacheKeys
+from app.core.database import after_commit
+from app.schemas.provider import ProviderResponse, ModelResponse
 from app.config.settings import settings
+from app.utils.datetime_utils import now
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -37,8 +40,17 @@ class ProviderService:
         self.redis = redis
         self.cache = CacheService(redis)
     
+    def _invalidate_after_commit(self, keys: List[str]) -> None:
+        """
+        Delete cache keys after the request transaction commits.
+        
+        Deleting before the commit lets a concurrent get_active_providers /
+        get_active_models_cached re-cache the old rows for the full TTL.
+        """
+        after_commit(self.db, lambda: self.cache.delete_many(keys))
+    
 
-    async def get_provider_by_id(self, provider_id: str) -> Optional[Provider]:
+    async def get_provider_by_id(self, provider_id: UUID) -> Optional[Provider]:
         """Get provider by ID."""
         result = await self.db.execute(
             select(Provider)
@@ -57,7 +69,9 @@ class ProviderService:
     async def get_all_providers(
         self,
         include_deleted: bool = False,
-        status_filter: Optional[ProviderStatus] = None
+        status_filter: Optional[ProviderStatus] = None,
+        skip: int = 0,
+        limit: Optional[int] = None
     ) -> List[Provider]:
         """
         Get all providers.
@@ -65,11 +79,14 @@ class ProviderService:
         Args:
             include_deleted: Include soft-deleted providers
             status_filter: Filter by status (ACTIVE/INACTIVE)
+            skip: Number of records to skip
+            limit: Maximum number of records to return (None for all)
             
         Returns:
             List of providers
         """
-        query = select(Provider).options(selectinload(Provider.models))
+        # ProviderResponse has no models field, so Provider.models is not loaded
+        query = select(Provider)
         
         if not include_deleted:
             query = query.where(Provider.deleted_at.is_(None))
@@ -77,14 +94,47 @@ class ProviderService:
         if status_filter:
             query = query.where(Provider.status == status_filter)
         
-        query = query.order_by(Provider.created_at)
+        query = query.order_by(Provider.created_at).offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
         
         result = await self.db.execute(query)
         return result.scalars().all()
     
+    async def get_active_providers(self) -> List[Dict[str, Any]]:
+        """
+        Get ACTIVE, non-deleted providers with cache-aside pattern.
+        
+        Returns:
+            List of serialized providers (ProviderResponse shape)
+        """
+        cache_key = CacheKeys.active_providers()
+        cached_data = await self.cache.get(cache_key, local=True)
+        
+        if cached_data is not None:
+            logger.debug("Cache hit for active providers")
+            return cached_data
+        
+        result = await self.db.execute(
+            select(Provider)
+            .where(
+                Provider.deleted_at.is_(None),
+                Provider.status == ProviderStatus.ACTIVE
+            )
+            .order_by(Provider.created_at)
+        )
+        providers = result.scalars().all()
+        data = [
+            ProviderResponse.model_validate(provider).model_dump(mode="json")
+            for provider in providers
+        ]
+        await self.cache.set(cache_key, data, ttl=settings.CACHE_ACTIVE_PROVIDERS_TTL)
+        
+        return data
+    
     async def update_provider(
         self,
-        provider_id: str,
+        provider_id: UUID,
         name: Optional[str] = None,
         api_base_url: Optional[str] = None,
         status: Optional[ProviderStatus] = None
@@ -123,14 +173,18 @@ class ProviderService:
         await self.db.flush()
         await self.db.refresh(provider)
         
-        await self.redis.delete(CacheKeys.provider(provider_id))
-        await self.redis.delete(CacheKeys.providers_list())
+        self._invalidate_after_commit([
+            CacheKeys.provider(provider_id),
+            CacheKeys.providers_list(),
+            CacheKeys.active_providers(),
+            CacheKeys.active_models(provider_id)
+        ])
         
         logger.info(f"Updated provider: {provider.name}")
         
         return provider
     
-    async def soft_delete_provider(self, provider_id: str) -> None:
+    async def soft_delete_provider(self, provider_id: UUID) -> None:
         """
         Soft delete provider and cascade soft delete related data.
         
@@ -155,40 +209,39 @@ class ProviderService:
         provider.soft_delete()
         provider.status = ProviderStatus.INACTIVE
         
-        result = await self.db.execute(
-            select(Model).where(
+        model_result = await self.db.execute(
+            update(Model)
+            .where(
                 Model.provider_id == provider_id,
                 Model.deleted_at.is_(None)
             )
+            .values(deleted_at=now(), is_active=False, updated_at=now())
         )
-        models = result.scalars().all()
-        for model in models:
-            model.soft_delete()
-            model.is_active = False
-            logger.info(f"Soft deleted model: {model.name}")
         
         config_result = await self.db.execute(
-            select(ProviderConfig).where(
+            update(ProviderConfig)
+            .where(
                 ProviderConfig.provider_id == provider_id,
                 ProviderConfig.is_deleted.is_(False)
             )
+            .values(is_deleted=True, is_active=False, updated_at=now())
+            .returning(ProviderConfig.bot_id)
         )
-        configs = config_result.scalars().all()
-        for config in configs:
-            config.is_deleted = True
-            config.is_active = False
-
-            await self.redis.delete(CacheKeys.bot_config(str(config.bot_id)))
-            logger.info(f"Soft deleted provider_config for bot: {config.bot_id}")
+        bot_ids = config_result.scalars().all()
         
         await self.db.flush()
         
-        await self.redis.delete(CacheKeys.provider(provider_id))
-        await self.redis.delete(CacheKeys.providers_list())
+        self._invalidate_after_commit([
+            CacheKeys.provider(provider_id),
+            CacheKeys.providers_list(),
+            CacheKeys.active_providers(),
+            CacheKeys.active_models(provider_id),
+            *(CacheKeys.bot_config(str(bot_id)) for bot_id in bot_ids)
+        ])
         
-        logger.info(f"Soft deleted provider: {provider.name} (with {len(models)} models, {len(configs)} configs)")
+        logger.info(f"Soft deleted provider: {provider.name} (with {model_result.rowcount} models, {len(bot_ids)} configs)")
     
-    async def restore_provider(self, provider_id: str) -> Provider:
+    async def restore_provider(self, provider_id: UUID) -> Provider:
         """
         Restore soft-deleted provider.
         
@@ -215,8 +268,12 @@ class ProviderService:
         await self.db.flush()
         await self.db.refresh(provider)
         
-        await self.redis.delete(CacheKeys.provider(provider_id))
-        await self.redis.delete(CacheKeys.providers_list())
+        self._invalidate_after_commit([
+            CacheKeys.provider(provider_id),
+            CacheKeys.providers_list(),
+            CacheKeys.active_providers(),
+            CacheKeys.active_models(provider_id)
+        ])
         
         logger.info(f"Restored provider: {provider.name}")
         
@@ -224,7 +281,7 @@ class ProviderService:
     
     # ========================================================================
     
-    async def get_model_by_id(self, model_id: str) -> Optional[Model]:
+    async def get_model_by_id(self, model_id: UUID) -> Optional[Model]:
         """Get model by ID."""
         result = await self.db.execute(
             select(Model).where(Model.id == model_id)
@@ -233,7 +290,7 @@ class ProviderService:
     
     async def get_models_by_provider(
         self,
-        provider_id: str,
+        provider_id: UUID,
         include_deleted: bool = False
     ) -> List[Model]:
         """
@@ -256,7 +313,7 @@ class ProviderService:
         result = await self.db.execute(query)
         return result.scalars().all()
     
-    async def get_active_models_by_provider(self, provider_id: str) -> List[Model]:
+    async def get_active_models_by_provider(self, provider_id: UUID) -> List[Model]:
         """
         Get only ACTIVE models for a provider.
         Used for bot configuration - only show selectable models.
@@ -276,6 +333,32 @@ class ProviderService:
         )
         return result.scalars().all()
     
+    async def get_active_models_cached(self, provider_id: UUID) -> List[Dict[str, Any]]:
+        """
+        Get ACTIVE models for a provider with cache-aside pattern.
+        
+        Args:
+            provider_id: Provider UUID
+            
+        Returns:
+            List of serialized models (ModelResponse shape)
+        """
+        cache_key = CacheKeys.active_models(provider_id)
+        cached_data = await self.cache.get(cache_key, local=True)
+        
+        if cached_data is not None:
+            logger.debug(f"Cache hit for active models of provider: {provider_id}")
+            return cached_data
+        
+        models = await self.get_active_models_by_provider(provider_id)
+        data = [
+            ModelResponse.model_validate(model).model_dump(mode="json")
+            for model in models
+        ]
+        await self.cache.set(cache_key, data, ttl=settings.CACHE_ACTIVE_PROVIDERS_TTL)
+        
+        return data
+    
     async def create_model(
         self,
         provider_id: UUID,
@@ -307,7 +390,7 @@ class ProviderService:
             HTTPException: If provider not found
         """
 
-        provider = await self.get_provider_by_id(str(provider_id))
+        provider = await self.get_provider_by_id(provider_id)
         if not provider:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -335,6 +418,11 @@ class ProviderService:
                 await self.db.flush()
                 await self.db.refresh(existing_model)
                 
+                self._invalidate_after_commit([
+                    CacheKeys.models_list(str(provider_id)),
+                    CacheKeys.active_models(str(provider_id))
+                ])
+                
                 logger.info(f"Restored model: {name} for provider {provider.name}")
                 return existing_model
             else:
@@ -355,7 +443,10 @@ class ProviderService:
         await self.db.flush()
         await self.db.refresh(new_model)
         
-        await self.redis.delete(CacheKeys.models_list(str(provider_id)))
+        self._invalidate_after_commit([
+            CacheKeys.models_list(str(provider_id)),
+            CacheKeys.active_models(str(provider_id))
+        ])
         
         logger.info(f"Created model: {name} for provider {provider.name}")
         
@@ -363,7 +454,7 @@ class ProviderService:
     
     async def update_model(
         self,
-        model_id: str,
+        model_id: UUID,
         name: Optional[str] = None,
         model_type: Optional[ModelType] = None,
         context_window: Optional[int] = None,
@@ -409,14 +500,17 @@ class ProviderService:
         await self.db.flush()
         await self.db.refresh(model)
         
-        await self.redis.delete(CacheKeys.model(model_id))
-        await self.redis.delete(CacheKeys.models_list(str(model.provider_id)))
+        self._invalidate_after_commit([
+            CacheKeys.model(model_id),
+            CacheKeys.models_list(str(model.provider_id)),
+            CacheKeys.active_models(str(model.provider_id))
+        ])
         
         logger.info(f"Updated model: {model.name}")
         
         return model
     
-    async def soft_delete_model(self, model_id: str) -> None:
+    async def soft_delete_model(self, model_id: UUID) -> None:
         """
         Soft delete model and cascade soft delete related provider_configs.
         
@@ -448,12 +542,15 @@ class ProviderService:
             config.is_deleted = True
             config.is_active = False
 
-            await self.redis.delete(CacheKeys.bot_config(str(config.bot_id)))
             logger.info(f"Soft deleted provider_config for bot: {config.bot_id}")
         
         await self.db.flush()
         
-        await self.redis.delete(CacheKeys.model(model_id))
-        await self.redis.delete(CacheKeys.models_list(str(model.provider_id)))
+        self._invalidate_after_commit([
+            CacheKeys.model(model_id),
+            CacheKeys.models_list(str(model.provider_id)),
+            CacheKeys.active_models(str(model.provider_id)),
+            *(CacheKeys.bot_config(str(config.bot_id)) for config in configs)
+        ])
         
         logger.info(f"Soft deleted model: {model.name} (with {len(configs)} configs)")
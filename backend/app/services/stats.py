@@ -3,31 +3,52 @@ from datetime import timedelta
 from typing import Optional, List
 from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from redis.asyncio import Redis
 
 from app.models.bot import Bot
 from app.models.user import User
 from app.models.visitor import Visitor, ChatSession
+from app.cache.service import CacheService
+from app.cache.keys import CacheKeys
 from app.common.enums import TimePeriod
+from app.config.settings import settings
 from app.schemas.stats import StatsSummary, VisitorActivity
 from app.utils.datetime_utils import now
 from app.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Lookback window and date_trunc unit per period
+_ACTIVITY_WINDOWS = {
+    TimePeriod.DAY: (timedelta(days=1), "hour"),
+    TimePeriod.MONTH: (timedelta(days=30), "day"),
+    TimePeriod.YEAR: (timedelta(days=365), "month"),
+}
+
 
 class StatsService:
     """Service for statistics and analytics."""
 
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, redis: Redis):
         self.db = db
+        self.cache = CacheService(redis)
 
     async def get_summary(self) -> StatsSummary:
         """
-        Get dashboard summary statistics.
+        Get dashboard summary statistics with cache-aside pattern.
+        
+        Cached for CACHE_STATS_SUMMARY_TTL; bot and user mutations bust the key,
+        visitor counts are allowed to lag by up to one TTL.
         
         Returns:
             StatsSummary with total bots, users, and visitors
         """
+        cache_key = CacheKeys.stats_summary()
+        cached_data = await self.cache.get(cache_key)
+        
+        if cached_data is not None:
+            return StatsSummary.model_validate(cached_data)
+        
         bots_result = await self.db.execute(
             select(func.count(Bot.id)).where(Bot.status == "active")
         )
@@ -43,11 +64,14 @@ class StatsService:
         )
         total_visitors = visitors_result.scalar() or 0
         
-        return StatsSummary(
+        summary = StatsSummary(
             total_bots=total_bots,
             total_users=total_users,
             total_visitors=total_visitors
         )
+        await self.cache.set(cache_key, summary.model_dump(), ttl=settings.CACHE_STATS_SUMMARY_TTL)
+        
+        return summary
 
     async def get_visitor_activity(
         self,
@@ -73,20 +97,12 @@ class StatsService:
                 return []
             bot_id = str(first_bot)
         
-        current_time = now()
-        if period == TimePeriod.DAY:
-            start_time = current_time - timedelta(days=1)
-            date_trunc = func.date_trunc('hour', ChatSession.started_at)
-        elif period == TimePeriod.MONTH:
-            start_time = current_time - timedelta(days=30)
-            date_trunc = func.date_trunc('day', ChatSession.started_at)
-        else:
-            start_time = current_time - timedelta(days=365)
-            date_trunc = func.date_trunc('month', ChatSession.started_at)
+        window, trunc_unit = _ACTIVITY_WINDOWS.get(period, _ACTIVITY_WINDOWS[TimePeriod.YEAR])
+        start_time = now() - window
         
         stmt = (
             select(
-                date_trunc.label('timestamp'),
+                func.date_trunc(trunc_unit, ChatSession.started_at).label('timestamp'),
                 func.count(func.distinct(ChatSession.visitor_id)).label('visitor_count')
             )
             .where(
@@ -1,6 +1,6 @@
 from minio import Minio
 from minio.error import S3Error
-from typing import Optional
+from typing import BinaryIO, Optional
 import io
 
 from app.config.settings import settings
@@ -131,6 +131,46 @@ class MinIOService:
             logger.error(f"Failed to upload file to {bucket_name}/{object_name}: {e}")
             raise
     
+    def upload_stream(
+        self,
+        bucket_name: str,
+        object_name: str,
+        stream: BinaryIO,
+        length: int,
+        content_type: str = "application/octet-stream"
+    ) -> str:
+        """
+        Upload file-like object to bucket without buffering it in memory.
+        
+        Args:
+            bucket_name: Bucket name
+            object_name: Object name in bucket
+            stream: Readable binary file-like object positioned at the start
+            length: Number of bytes to read from stream
+            content_type: MIME type of file
+            
+        Returns:
+            Object path
+        """
+        try:
+            if not self.client.bucket_exists(bucket_name):
+                self.create_bucket(bucket_name)
+            
+            self.client.put_object(
+                bucket_name,
+                object_name,
+                stream,
+                length=length,
+                content_type=content_type
+            )
+            
+            logger.info(f"Uploaded file to {bucket_name}/{object_name}")
+            return f"{bucket_name}/{object_name}"
+            
+        except S3Error as e:
+            logger.error(f"Failed to upload file to {bucket_name}/{object_name}: {e}")
+            raise
+    
     def download_file(self, bucket_name: str, object_name: str) -> bytes:
         """
         Download file from bucket.
@@ -174,6 +214,24 @@ class MinIOService:
             logger.error(f"Failed to delete file from {bucket_name}/{object_name}: {e}")
             raise
     
+    def list_objects(self, bucket_name: str, prefix: str = "") -> list:
+        """
+        List objects in bucket with their metadata (size, last_modified, etag).
+        
+        Args:
+            bucket_name: Bucket name
+            prefix: Object prefix filter
+            
+        Returns:
+            List of MinIO Object entries
+        """
+        try:
+            return list(self.client.list_objects(bucket_name, prefix=prefix, recursive=True))
+            
+        except S3Error as e:
+            logger.error(f"Failed to list objects in {bucket_name}: {e}")
+            return []
+    
     def list_files(self, bucket_name: str, prefix: str = "") -> list:
         """
         List files in bucket.
@@ -124,6 +124,8 @@ class UserService:
         await self.db.flush()
         await self.db.refresh(user)
         
+        await self.cache.delete(CacheKeys.stats_summary())
+        
         logger.info(f"Created user: {user.email} with role: {user.role}")
         return user
     
@@ -179,6 +181,7 @@ class UserService:
         
         cache_key = CacheKeys.user(user_id)
         await self.cache.delete(cache_key)
+        await self.cache.delete(CacheKeys.stats_summary())
         
         logger.info(f"Soft deleted user: {user.email}")
     
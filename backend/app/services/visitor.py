@@ -5,10 +5,10 @@ import json
 import uuid
 import asyncio
 import time
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, desc, cast
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import selectinload, contains_eager
 from sqlalchemy.orm.attributes import flag_modified
 from sqlalchemy.dialects.postgresql import INET
 from uuid import UUID
@@ -148,7 +148,8 @@ class VisitorService:
     async def update_visitor_info(
         self, 
         visitor_id: str, 
-        validated_info: Dict[str, Any]
+        validated_info: Dict[str, Any],
+        flush: bool = True
     ) -> bool:
         """
         Update visitor information with already-validated data from API layer.
@@ -157,6 +158,7 @@ class VisitorService:
         Args:
             visitor_id: Visitor UUID
             validated_info: Pre-validated visitor data (validated by Pydantic schema in API layer)
+            flush: Flush immediately; pass False when the caller commits right after
             
         Returns:
             True if any field was updated, False otherwise
@@ -189,7 +191,8 @@ class VisitorService:
                         updated_fields.append(f"{field_name}: {current_value} → {field_value}")
             
             if updated_fields:
-                await self.db.flush()
+                if flush:
+                    await self.db.flush()
                 logger.info(
                     "Updated visitor info",
                     extra={
@@ -251,6 +254,62 @@ class VisitorService:
         )
         return session
     
+    async def init_visitor_session(
+        self,
+        bot_id: str,
+        ip_address: str,
+        session_token: str,
+        extra_data: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Visitor, ChatSession]:
+        """
+        Resolve the visitor and session for a widget load.
+        
+        A returning visitor (existing session token from the same IP and bot)
+        is resolved with a single joined query; otherwise falls back to
+        find_or_create_visitor + create_or_find_session.
+        
+        Args:
+            bot_id: Bot UUID
+            ip_address: Client IP address
+            session_token: Widget session token
+            extra_data: User agent / referrer data to record
+            
+        Returns:
+            Tuple of (visitor, session)
+        """
+        stmt = (
+            select(ChatSession, Visitor.ip_address == cast(ip_address, INET))
+            .join(ChatSession.visitor)
+            .where(
+                and_(
+                    ChatSession.session_token == session_token,
+                    Visitor.bot_id == bot_id
+                )
+            )
+            .options(contains_eager(ChatSession.visitor))
+        )
+        row = (await self.db.execute(stmt)).first()
+        
+        if row:
+            session, same_ip = row
+            if same_ip:
+                if extra_data:
+                    session.extra_data = {**session.extra_data, **extra_data}
+                return session.visitor, session
+        
+        visitor = await self.find_or_create_visitor(
+            bot_id=bot_id,
+            ip_address=ip_address,
+            extra_data=extra_data
+        )
+        session = await self.create_or_find_session(
+            bot_id=bot_id,
+            visitor_id=str(visitor.id),
+            session_token=session_token,
+            extra_data=extra_data
+        )
+        return visitor, session
+    
     async def trigger_lead_grading(
         self,
         visitor_id: str,
@@ -2,13 +2,19 @@
 Widget file management service.
 Handles upload, storage, and serving of widget JavaScript files.
 """
-from typing import Optional, Dict, List, BinaryIO
-import io
+from typing import Optional, Dict, List, BinaryIO, Tuple
+import gzip
+import os
+import shutil
+import time
+from tempfile import SpooledTemporaryFile
 
+from app.cache.listener import local_cache_listener
 from app.services.storage import minio_service
 from app.config.settings import settings
 from app.common.constants import WidgetFile
 from app.utils.logging import get_logger
+from app.utils.request_utils import compute_etag
 
 logger = get_logger(__name__)
 
@@ -18,6 +24,8 @@ class WidgetService:
     
     def __init__(self):
         self.bucket = settings.MINIO_PUBLIC_BUCKET
+        # (version, encoding) -> (expires_at, content, etag); per-process, cleared on upload/delete
+        self._content_cache: Dict[Tuple[Optional[str], Optional[str]], Tuple[float, bytes, str]] = {}
     
     def validate_file(self, filename: str, file_size: int) -> None:
         """
@@ -30,7 +38,7 @@ class WidgetService:
         Raises:
             ValueError: If validation fails
         """
-        if not any(filename.lower().endswith(ext) for ext in WidgetFile.ALLOWED_EXTENSIONS):
+        if os.path.splitext(filename)[1].lower() not in WidgetFile.ALLOWED_EXTENSIONS:
             raise ValueError(WidgetFile.ERROR_INVALID_EXTENSION)
         
         if file_size > WidgetFile.MAX_FILE_SIZE_BYTES:
@@ -103,11 +111,11 @@ class WidgetService:
             versioned_key = keys["versioned"]
             logger.info(f"Uploading versioned widget: {versioned_key}")
             
-            content = file_data.read()
-            minio_service.upload_file(
+            minio_service.upload_stream(
                 bucket_name=self.bucket,
                 object_name=versioned_key,
-                file_data=content,
+                stream=file_data,
+                length=file_size,
                 content_type="application/javascript"
             )
             uploaded_keys["versioned"] = versioned_key
@@ -117,15 +125,33 @@ class WidgetService:
         latest_key = keys["latest"]
         logger.info(f"Uploading latest widget: {latest_key}")
         
-        content = file_data.read()
-        minio_service.upload_file(
+        minio_service.upload_stream(
             bucket_name=self.bucket,
             object_name=latest_key,
-            file_data=content,
+            stream=file_data,
+            length=file_size,
             content_type="application/javascript"
         )
         uploaded_keys["latest"] = latest_key
         
+        # Store gzip siblings so serve_widget_js never compresses per request
+        file_data.seek(0)
+        with SpooledTemporaryFile(max_size=WidgetFile.GZIP_SPOOL_MAX_BYTES) as compressed:
+            with gzip.GzipFile(fileobj=compressed, mode="wb", compresslevel=9) as gz:
+                shutil.copyfileobj(file_data, gz)
+            compressed_size = compressed.tell()
+            
+            for key in uploaded_keys.values():
+                compressed.seek(0)
+                minio_service.upload_stream(
+                    bucket_name=self.bucket,
+                    object_name=f"{key}{WidgetFile.GZIP_SUFFIX}",
+                    stream=compressed,
+                    length=compressed_size,
+                    content_type="application/javascript"
+                )
+        self.clear_content_cache()
+        
         logger.info(
             "Widget uploaded successfully",
             extra={
@@ -138,12 +164,13 @@ class WidgetService:
         
         return uploaded_keys
     
-    def get_widget(self, version: Optional[str] = None) -> bytes:
+    def get_widget(self, version: Optional[str] = None, encoding: Optional[str] = None) -> bytes:
         """
         Get widget file from MinIO.
         
         Args:
             version: Widget version (optional). If None, gets latest.
+            encoding: "gzip" to fetch the pre-compressed sibling (optional)
             
         Returns:
             File content as bytes
@@ -153,6 +180,8 @@ class WidgetService:
         """
         keys = self.get_object_keys(version)
         object_name = keys.get("versioned") if version else keys["latest"]
+        if encoding == "gzip":
+            object_name = f"{object_name}{WidgetFile.GZIP_SUFFIX}"
         
         try:
             response = minio_service.client.get_object(self.bucket, object_name)
@@ -165,6 +194,60 @@ class WidgetService:
             logger.warning(f"Widget file not found: {object_name}")
             raise FileNotFoundError(WidgetFile.ERROR_FILE_NOT_FOUND)
     
+    def get_storage_url(self, version: Optional[str] = None) -> str:
+        """
+        Get direct public-bucket URL for widget file.
+        
+        Args:
+            version: Widget version (optional). If None, gets latest.
+            
+        Returns:
+            Public MinIO URL of the widget object
+        """
+        keys = self.get_object_keys(version)
+        object_name = keys.get("versioned") if version else keys["latest"]
+        return minio_service.get_public_url(object_name)
+    
+    def clear_content_cache(self) -> None:
+        """Drop widget content cached in this process."""
+        self._content_cache.clear()
+    
+    def get_widget_cached(
+        self,
+        version: Optional[str] = None,
+        encoding: Optional[str] = None
+    ) -> Tuple[bytes, str]:
+        """
+        Get widget file, reusing content fetched within WIDGET_JS_CACHE_TTL.
+        
+        Args:
+            version: Widget version (optional). If None, gets latest.
+            encoding: "gzip" for the pre-compressed variant (optional)
+            
+        Returns:
+            Tuple of (file content, ETag)
+            
+        Raises:
+            FileNotFoundError: If file not found
+        """
+        cache_key = (version, encoding)
+        cached = self._content_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1], cached[2]
+        
+        if encoding == "gzip":
+            try:
+                content = self.get_widget(version=version, encoding=encoding)
+            except FileNotFoundError:
+                # Uploaded before gzip siblings existed; compress once per cache window
+                content = gzip.compress(self.get_widget_cached(version=version)[0], compresslevel=9)
+        else:
+            content = self.get_widget(version=version)
+        
+        etag = compute_etag(content)
+        self._content_cache[cache_key] = (time.monotonic() + settings.WIDGET_JS_CACHE_TTL, content, etag)
+        return content, etag
+    
     def list_widgets(self) -> List[Dict]:
         """
         List all widget files in MinIO.
@@ -172,27 +255,23 @@ class WidgetService:
         Returns:
             List of file metadata dicts
         """
-        file_names = minio_service.list_files(
+        # list_objects already carries size/mtime/etag, so no stat_object per file
+        objects = minio_service.list_objects(
             bucket_name=self.bucket,
             prefix=f"{WidgetFile.STORAGE_PREFIX}/"
         )
         
-        files = []
-        for file_name in file_names:
-            try:
-                stat = minio_service.client.stat_object(self.bucket, file_name)
-                
-                files.append({
-                    "filename": file_name.replace(f"{WidgetFile.STORAGE_PREFIX}/", ""),
-                    "full_path": file_name,
-                    "size": stat.size,
-                    "last_modified": stat.last_modified.isoformat() if stat.last_modified else None,
-                    "etag": stat.etag
-                })
-            except Exception as e:
-                logger.warning(f"Failed to get stats for {file_name}: {e}")
-                
-        return files
+        return [
+            {
+                "filename": obj.object_name.replace(f"{WidgetFile.STORAGE_PREFIX}/", ""),
+                "full_path": obj.object_name,
+                "size": obj.size,
+                "last_modified": obj.last_modified.isoformat() if obj.last_modified else None,
+                "etag": obj.etag
+            }
+            for obj in objects
+            if not obj.object_name.endswith(WidgetFile.GZIP_SUFFIX)
+        ]
     
     def delete_widget(self, filename: str) -> None:
         """
@@ -215,6 +294,8 @@ class WidgetService:
             raise FileNotFoundError(f"{WidgetFile.ERROR_FILE_NOT_FOUND}: {filename}")
         
         minio_service.client.remove_object(self.bucket, filename)
+        minio_service.client.remove_object(self.bucket, f"{filename}{WidgetFile.GZIP_SUFFIX}")
+        self.clear_content_cache()
         
         logger.info(f"Widget file deleted: {filename}")
     
@@ -251,3 +332,4 @@ class WidgetService:
         return f'<script defer src="{url}" data-bot-id="YOUR_BOT_ID"></script>'
 
 widget_service = WidgetService()
+local_cache_listener.register("widget", lambda _: widget_service.clear_content_cache())
@@ -150,6 +150,14 @@ class RequestLoggerAdapter(logging.LoggerAdapter):
             kwargs['extra']['user_id'] = self.user_id
         return msg, kwargs
 
+class ContextLoggerAdapter(logging.LoggerAdapter):
+    """Logger adapter that merges bound context into each call's extra"""
+
+    def process(self, msg, kwargs):
+        extra = kwargs.get('extra')
+        kwargs['extra'] = {**self.extra, **extra} if extra else self.extra
+        return msg, kwargs
+
 def get_request_logger(
     name: str,
     request_id: str,
@@ -1,4 +1,5 @@
 from typing import Optional, Tuple, List
+import hashlib
 import uuid
 from fastapi import Request
 from urllib.parse import urlsplit
@@ -114,3 +115,74 @@ def get_client_ip(request: Request) -> str:
         return request.client.host
     
     return "unknown"
+
+
+def compute_etag(body: bytes) -> str:
+    """
+    Strong ETag for a response body.
+
+    Args:
+        body: Encoded response body
+
+    Returns:
+        Quoted ETag header value
+    """
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the client's If-None-Match already covers etag.
+
+    Args:
+        request: Incoming request
+        etag: Current ETag of the resource
+
+    Returns:
+        True if a 304 Not Modified can be sent
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, so CDN-weakened W/"..." tags still match
+    return any(
+        tag.strip().removeprefix("W/") == etag
+        for tag in if_none_match.split(",")
+    )
+
+
+def accepts_encoding(request: Request, encoding: str) -> bool:
+    """
+    Check whether the client's Accept-Encoding allows a content coding.
+
+    Args:
+        request: Incoming request
+        encoding: Content coding to check (e.g. "gzip")
+
+    Returns:
+        True if encoding (or "*" when encoding is not listed) has q > 0
+    """
+    accept_encoding = request.headers.get("accept-encoding")
+    if not accept_encoding:
+        return False
+
+    qvalues = {}
+    for token in accept_encoding.split(","):
+        coding, _, params = token.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value.strip())
+                except ValueError:
+                    q = 0.0
+        qvalues[coding] = q
+
+    q = qvalues.get(encoding.lower(), qvalues.get("*", 0.0))
+    return q > 0
@@ -1,6 +1,8 @@
 """Security utilities for password hashing, token management, and webhook verification."""
 import hmac
 import hashlib
+import ssl
+from typing import Optional
 from fastapi import HTTPException, Security, status
 from fastapi.security import APIKeyHeader
 
@@ -11,6 +13,68 @@ logger = get_logger(__name__)
 
 API_KEY_HEADER = "X-Internal-API-Key"
 
+# Keyed HMAC prototype; copying it skips the per-call key setup
+_WEBHOOK_HMAC = (
+    hmac.new(settings.BACKEND_WEBHOOK_SECRET.encode(), digestmod=hashlib.sha256)
+    if settings.BACKEND_WEBHOOK_SECRET
+    else None
+)
+
+
+def log_webhook_hmac_backend() -> None:
+    """
+    Log the OpenSSL build backing hashlib/hmac and whether the CPU has SHA-NI.
+
+    Webhook signatures go through OpenSSL's SHA-256, which dispatches to the
+    SHA-NI instructions when the CPU advertises them; without them every
+    webhook body is hashed with the much slower scalar path.
+    """
+    sha_ni = None
+    try:
+        with open("/proc/cpuinfo") as cpuinfo:
+            sha_ni = any(
+                line.startswith("flags") and " sha_ni" in line
+                for line in cpuinfo
+            )
+    except OSError:
+        pass
+
+    if sha_ni is False:
+        logger.warning(f"CPU does not advertise sha_ni; webhook HMAC uses scalar SHA-256 ({ssl.OPENSSL_VERSION})")
+    else:
+        logger.info(f"Webhook HMAC backend: {ssl.OPENSSL_VERSION}, sha_ni={sha_ni}")
+
+
+def new_webhook_hmac() -> Optional[hmac.HMAC]:
+    """
+    Get a fresh keyed HMAC for incremental webhook signature checks.
+
+    Returns:
+        HMAC to feed body chunks into, or None if BACKEND_WEBHOOK_SECRET is not set.
+    """
+    return _WEBHOOK_HMAC.copy() if _WEBHOOK_HMAC is not None else None
+
+
+def webhook_signature_matches(mac: hmac.HMAC, signature: str) -> bool:
+    """
+    Compare a fed HMAC against a hex signature header in constant time.
+
+    Compares the raw 32-byte digests, so no hex digest string is built.
+
+    Args:
+        mac: HMAC that has consumed the full payload.
+        signature: Hex signature from the 'X-Webhook-Signature' header.
+
+    Returns:
+        True if the signature matches, False if it differs or is not valid hex.
+    """
+    try:
+        expected = bytes.fromhex(signature)
+    except ValueError:
+        return False
+
+    return hmac.compare_digest(mac.digest(), expected)
+
 
 def verify_webhook_signature(payload: bytes, signature: str) -> bool:
     """
@@ -23,17 +87,14 @@ def verify_webhook_signature(payload: bytes, signature: str) -> bool:
     Returns:
         True if the signature is valid, False otherwise.
     """
-    if not settings.BACKEND_WEBHOOK_SECRET:
+    mac = new_webhook_hmac()
+    if mac is None:
         logger.warning("BACKEND_WEBHOOK_SECRET is not set. Skipping signature verification.")
         return True
 
-    expected_signature = hmac.new(
-        settings.BACKEND_WEBHOOK_SECRET.encode(),
-        payload,
-        hashlib.sha256
-    ).hexdigest()
+    mac.update(payload)
 
-    return hmac.compare_digest(expected_signature, signature)
+    return webhook_signature_matches(mac, signature)
 
 
 async def require_internal_api_key(api_key: str = Security(APIKeyHeader(name=API_KEY_HEADER))):
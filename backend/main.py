@@ -6,9 +6,12 @@ from fastapi.openapi.docs import get_swagger_ui_html, get_redoc_html
 import secrets
 
 from app.config.settings import settings
+from app.cache.listener import local_cache_listener
 from app.core.database import db_manager, redis_manager
+from app.core.pubsub import pubsub_pool
 from app.core.middleware import setup_middlewares
 from app.utils.logging import setup_logging, get_logger
+from app.utils.security import log_webhook_hmac_backend
 from app.api.v1.router import api_router
 from app.common.enums import Environment
 from app.services.chat_queue import chat_queue_service
@@ -60,6 +63,7 @@ async def lifespan(app: FastAPI):
     Handles startup and shutdown events.
     """
     logger.info("Starting application...")
+    log_webhook_hmac_backend()
     
     try:
         await db_manager.connect()
@@ -77,6 +81,9 @@ async def lifespan(app: FastAPI):
         # Start progress listener service for real-time notification updates
         await progress_listener_service.start()
         
+        # Drop in-process caches when another worker invalidates an entity
+        await local_cache_listener.start()
+        
         try:
             if not minio_service.client.bucket_exists(settings.MINIO_PUBLIC_BUCKET):
                 logger.info("Creating public assets bucket...")
@@ -99,7 +106,9 @@ async def lifespan(app: FastAPI):
     try:
         # Stop progress listener service
         await progress_listener_service.stop()
+        await local_cache_listener.stop()
         
+        await pubsub_pool.close()
         await redis_manager.disconnect()
         logger.info("Redis connection closed")
 